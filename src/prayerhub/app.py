@@ -63,7 +63,11 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
         from prayerhub.command_runner import SubprocessCommandRunner
         from prayerhub.background_keepalive import BackgroundKeepAliveService
         from prayerhub.playback import PlaybackHandler
-        from prayerhub.playback_timeout import FfprobeDurationProbe, PlaybackTimeoutPolicy
+        from prayerhub.playback_timeout import (
+            FfprobeDurationProbe,
+            HeaderDurationProbe,
+            PlaybackTimeoutPolicy,
+        )
 
         runner = SubprocessCommandRunner()
         router = AudioRouter(runner)
@@ -82,11 +86,16 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
                 volume_cycle_step_seconds=config.audio.background_keepalive_volume_cycle_step_seconds,
             )
         player = AudioPlayer(runner, router, monitor=keepalive_service)
-        duration_probe = FfprobeDurationProbe(
-            runner,
-            timeout_seconds=config.audio.ffprobe_timeout_seconds,
-        )
+        duration_probe = None
+        # Fixed timeouts never consult a probe, so only build one for auto.
         if config.audio.playback_timeout_strategy == "auto":
+            # Header parsing covers WAV and MP3 without a subprocess; ffprobe handles the rest.
+            duration_probe = HeaderDurationProbe(
+                fallback=FfprobeDurationProbe(
+                    runner,
+                    timeout_seconds=config.audio.ffprobe_timeout_seconds,
+                )
+            )
             _prewarm_duration_cache(duration_probe, config.audio)
         timeout_policy = PlaybackTimeoutPolicy(
             strategy=config.audio.playback_timeout_strategy,
@@ -4,7 +4,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import IO, Any, Dict, Optional
 
 import yaml
 
@@ -140,22 +140,52 @@ def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any
     return merged
 
 
-def _load_yaml(path: Path) -> Dict[str, Any]:
-    try:
-        data = yaml.safe_load(path.read_text(encoding="utf-8"))
-    except OSError as exc:
-        raise ConfigError(f"Failed to read config file: {path}") from exc
+# Prefer the libyaml parser when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _parse_yaml(stream: str | IO[str], source: object) -> Dict[str, Any]:
+    data = yaml.load(stream, Loader=_YAML_LOADER)
     if data is None:
         return {}
     if not isinstance(data, dict):
-        raise ConfigError(f"Expected mapping at root of config file: {path}")
+        raise ConfigError(f"Expected mapping at root of config file: {source}")
     return data
 
 
+def _load_yaml(path: Path) -> Dict[str, Any]:
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise ConfigError(f"Failed to read config file: {path}") from exc
+    return _parse_yaml(text, path)
+
+
+def _list_dir(directory: Path) -> Optional[frozenset[str]]:
+    try:
+        with os.scandir(directory) as entries:
+            # is_file() follows symlinks, so dangling links are left out like
+            # exists() would; plain files need no extra stat.
+            return frozenset(entry.name for entry in entries if entry.is_file())
+    except FileNotFoundError:
+        return frozenset()
+    except OSError:
+        # Unlistable directories fall back to per-file exists() checks.
+        return None
+
+
 class ConfigLoader:
-    def __init__(self, root_dir: Path | None = None, config_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        root_dir: Path | None = None,
+        config_path: Path | None = None,
+        base_dir: Path | None = None,
+    ) -> None:
         self._root_dir = root_dir
         self._config_path = config_path
+        # Relative audio paths resolve from base_dir, or the working directory.
+        # With base_dir set they are stored resolved, so playback finds the same files.
+        self._base_dir = base_dir
 
     def load(self) -> AppConfig:
         root_dir = self._resolve_root_dir()
@@ -163,8 +193,12 @@ class ConfigLoader:
         if not config_path.exists():
             raise ConfigError(f"Missing base config file: {config_path}")
 
-        merged: Dict[str, Any] = {}
-        merged = _deep_merge(merged, _load_yaml(config_path))
+        return self.load_mapping(self.merge_overlays(_load_yaml(config_path)))
+
+    def merge_overlays(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Apply config.d/*.yml and secrets.yml from the root dir on top of data.
+        root_dir = self._resolve_root_dir()
+        merged = _deep_merge({}, data)
 
         config_d = root_dir / "config.d"
         if config_d.exists():
@@ -175,7 +209,15 @@ class ConfigLoader:
         if secrets_path.exists():
             merged = _deep_merge(merged, _load_yaml(secrets_path))
 
-        config = self._build_config(merged)
+        return merged
+
+    def load_from_stream(self, stream: IO[str]) -> AppConfig:
+        # Single-document load with no config.d or secrets overlays.
+        return self.load_mapping(_parse_yaml(stream, getattr(stream, "name", "<stream>")))
+
+    def load_mapping(self, data: Dict[str, Any]) -> AppConfig:
+        # Build and validate an already-parsed mapping without touching disk.
+        config = self._build_config(data)
         self._validate(config)
         return config
 
@@ -194,6 +236,19 @@ class ConfigLoader:
             return self._config_path
         return root_dir / "config.yml"
 
+    def _resolve_audio_path(self, path_str: str) -> Path:
+        path = Path(path_str)
+        if path.is_absolute():
+            return path
+        base_dir = self._base_dir if self._base_dir is not None else Path.cwd()
+        return base_dir / path
+
+    def _audio_path(self, value: Any) -> str:
+        path_str = str(value)
+        if self._base_dir is None:
+            return path_str
+        return str(self._resolve_audio_path(path_str))
+
     def _build_config(self, data: Dict[str, Any]) -> AppConfig:
         try:
             location_data = data["location"]
@@ -226,30 +281,30 @@ class ConfigLoader:
         )
         adhan_data = audio_data["adhan"]
         adhan = AdhanAudio(
-            fajr=adhan_data["fajr"],
-            dhuhr=adhan_data["dhuhr"],
-            asr=adhan_data["asr"],
-            maghrib=adhan_data["maghrib"],
-            isha=adhan_data["isha"],
+            fajr=self._audio_path(adhan_data["fajr"]),
+            dhuhr=self._audio_path(adhan_data["dhuhr"]),
+            asr=self._audio_path(adhan_data["asr"]),
+            maghrib=self._audio_path(adhan_data["maghrib"]),
+            isha=self._audio_path(adhan_data["isha"]),
         )
         quran_schedule = tuple(
-            QuranScheduleItem(time=item["time"], file=item["file"])
+            QuranScheduleItem(time=item["time"], file=self._audio_path(item["file"]))
             for item in audio_data.get("quran_schedule", [])
         )
         notifications_data = audio_data["notifications"]
         notifications = NotificationAudio(
-            sunrise=notifications_data["sunrise"],
-            sunset=notifications_data["sunset"],
-            midnight=notifications_data["midnight"],
-            tahajjud=notifications_data["tahajjud"],
+            sunrise=self._audio_path(notifications_data["sunrise"]),
+            sunset=self._audio_path(notifications_data["sunset"]),
+            midnight=self._audio_path(notifications_data["midnight"]),
+            tahajjud=self._audio_path(notifications_data["tahajjud"]),
         )
         audio = AudioConfig(
-            test_audio=audio_data["test_audio"],
-            connected_tone=audio_data["connected_tone"],
+            test_audio=self._audio_path(audio_data["test_audio"]),
+            connected_tone=self._audio_path(audio_data["connected_tone"]),
             background_keepalive_enabled=bool(
                 audio_data.get("background_keepalive_enabled", False)
             ),
-            background_keepalive_path=str(
+            background_keepalive_path=self._audio_path(
                 audio_data.get(
                     "background_keepalive_path",
                     audio_data["test_audio"],
@@ -347,11 +402,15 @@ class ConfigLoader:
         for item in audio.quran_schedule:
             audio_paths.append((f"quran_{item.time}", item.file))
 
+        # Most files share a directory, so list each one once instead of a stat per file.
+        listings: Dict[Path, Optional[frozenset[str]]] = {}
         for label, path_str in audio_paths:
-            path = Path(path_str)
-            if not path.is_absolute():
-                path = Path.cwd() / path
-            if not path.exists():
+            path = self._resolve_audio_path(path_str)
+            if path.parent not in listings:
+                listings[path.parent] = _list_dir(path.parent)
+            names = listings[path.parent]
+            exists = path.name in names if names is not None else path.exists()
+            if not exists:
                 raise ConfigError(f"Audio file does not exist ({label}): {path}")
 
     def _validate_volumes(self, volumes: AudioVolumes) -> None:
@@ -383,9 +442,7 @@ class ConfigLoader:
         if not 0 <= audio.background_keepalive_volume_percent <= 100:
             raise ConfigError("background_keepalive_volume_percent out of range")
         if audio.background_keepalive_enabled:
-            path = Path(audio.background_keepalive_path)
-            if not path.is_absolute():
-                path = Path.cwd() / path
+            path = self._resolve_audio_path(audio.background_keepalive_path)
             if not path.exists():
                 raise ConfigError(f"Background keepalive audio file does not exist: {path}")
         if audio.background_keepalive_nice is not None:
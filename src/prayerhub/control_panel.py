@@ -4,20 +4,24 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
 from pathlib import Path
+from functools import lru_cache
 import re
-import tempfile
-from typing import Callable, Optional, Sequence
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
 
 import yaml
 
-from flask import Flask, redirect, render_template_string, request, session, url_for
-from werkzeug.security import check_password_hash
-
 from prayerhub.command_runner import SubprocessCommandRunner
 from prayerhub.config import ConfigError, ConfigLoader
 from prayerhub.prayer_times import DayPlan, PrayerTimeService
 from prayerhub.test_scheduler import TestScheduleService
 
+if TYPE_CHECKING:
+    from flask import Flask
+
+
+# The libyaml emitter is much faster when PyYAML was built with it.
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 LOGIN_TEMPLATE = """
 <!doctype html>
@@ -422,8 +426,36 @@ CONFIG_TEMPLATE = """
 """
 
 
+_TEMPLATES = {
+    "login.html": LOGIN_TEMPLATE,
+    "main.html": MAIN_TEMPLATE,
+}
+
+
+@lru_cache(maxsize=1)
+def _template_bytecode_cache():
+    # Compiled template code is shared by every server instance in the process.
+    from jinja2 import BytecodeCache
+
+    class MemoryBytecodeCache(BytecodeCache):
+        def __init__(self) -> None:
+            self._store: dict[str, bytes] = {}
+
+        def load_bytecode(self, bucket) -> None:
+            code = self._store.get(bucket.key)
+            if code is not None:
+                bucket.bytecode_from_string(code)
+
+        def dump_bytecode(self, bucket) -> None:
+            self._store[bucket.key] = bucket.bytecode_to_string()
+
+    return MemoryBytecodeCache()
+
+
 def _login_required(handler):
     def wrapper(*args, **kwargs):
+        from flask import redirect, session, url_for
+
         if "user" not in session:
             return redirect(url_for("login"))
         return handler(*args, **kwargs)
@@ -466,8 +498,19 @@ class ControlPanelServer:
         return self._app
 
     def _create_app(self) -> Flask:
+        # Flask and friends are imported here so importing this module stays cheap.
+        from flask import Flask, redirect, render_template, request, session, url_for
+        from jinja2 import DictLoader
+        from werkzeug.security import check_password_hash
+
         app = Flask(__name__)
         app.secret_key = self.secret_key
+        # Loader-backed templates are compiled once per app, not per request.
+        app.jinja_options = {
+            **app.jinja_options,
+            "loader": DictLoader(_TEMPLATES),
+            "bytecode_cache": _template_bytecode_cache(),
+        }
 
         @app.route("/login", methods=["GET", "POST"])
         def login():
@@ -483,7 +526,7 @@ class ControlPanelServer:
                     return redirect(url_for("dashboard"))
                 self._logger.warning("Control panel login failed for %s", username)
                 error = "Invalid credentials"
-            return render_template_string(LOGIN_TEMPLATE, error=error)
+            return render_template("login.html", error=error)
 
         @app.route("/")
         @_login_required
@@ -501,8 +544,8 @@ class ControlPanelServer:
                 data = _load_config_data(config_path)
                 fields = _config_fields(data)
                 quran_fields = _quran_form_fields(data)
-            return render_template_string(
-                MAIN_TEMPLATE,
+            return render_template(
+                "main.html",
                 status_label="OK",
                 timezone=self._timezone_label(),
                 upcoming_events=upcoming_events,
@@ -562,8 +605,8 @@ class ControlPanelServer:
         def config_page():
             config_path = self._resolve_config_path()
             if config_path is None:
-                return render_template_string(
-                    MAIN_TEMPLATE,
+                return render_template(
+                    "main.html",
                     fields=[],
                     quran_fields=[],
                     error="Config path is not configured.",
@@ -612,8 +655,8 @@ class ControlPanelServer:
             fields = _config_fields(data)
             quran_fields = _quran_form_fields(data)
             prayer_times, prayer_source = self._prayer_times_today()
-            return render_template_string(
-                MAIN_TEMPLATE,
+            return render_template(
+                "main.html",
                 fields=fields,
                 quran_fields=quran_fields,
                 error=error,
@@ -777,29 +820,52 @@ def _job_kind_and_name(job_id: str) -> tuple[str, str]:
     return "job", job_id
 
 
+# Display order for the dashboard; plans may carry any subset of these names.
+_PLAN_TIME_ORDER = (
+    "fajr",
+    "sunrise",
+    "dhuhr",
+    "asr",
+    "maghrib",
+    "isha",
+    "sunset",
+    "midnight",
+    "tahajjud",
+)
+
+
 def _plan_times(plan: Optional[DayPlan]) -> list[dict]:
     if not plan:
         return []
-    order = [
-        "fajr",
-        "sunrise",
-        "dhuhr",
-        "asr",
-        "maghrib",
-        "isha",
-        "sunset",
-        "midnight",
-        "tahajjud",
+    times = plan.times
+    return [
+        {"name": name, "time": times[name]}
+        for name in _PLAN_TIME_ORDER
+        if name in times
     ]
-    items = []
-    for name in order:
-        if name in plan.times:
-            items.append({"name": name, "time": plan.times[name]})
-    return items
+
+
+# Enough for max_entries typical log lines without reading the whole file.
+_LOG_TAIL_BYTES = 256 * 1024
+
+
+def _read_log_tail(path: Path, max_bytes: int) -> str:
+    with path.open("rb") as handle:
+        start = max(0, path.stat().st_size - max_bytes)
+        handle.seek(start)
+        data = handle.read()
+    if start > 0:
+        # The seek usually lands mid-line; drop that partial line.
+        _, _, data = data.partition(b"\n")
+    return data.decode("utf-8", errors="replace")
 
 
 def _read_log_entries(
-    log_path: Optional[str], *, hours: int, max_entries: int
+    log_path: Optional[str],
+    *,
+    hours: int,
+    max_entries: int,
+    max_bytes: int = _LOG_TAIL_BYTES,
 ) -> list[str]:
     if not log_path:
         return ["No log file configured."]
@@ -807,7 +873,7 @@ def _read_log_entries(
     if not path.exists():
         return ["Log file not found."]
     try:
-        content = path.read_text(encoding="utf-8")
+        content = _read_log_tail(path, max_bytes)
     except OSError:
         return ["Log unavailable."]
 
@@ -837,7 +903,7 @@ def _load_config_data(path: Path) -> dict:
 
 def _save_config_data(path: Path, data: dict) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    payload = yaml.safe_dump(data, sort_keys=False)
+    payload = yaml.dump(data, Dumper=_YAML_DUMPER, sort_keys=False)
     tmp_path = path.with_suffix(".tmp")
     tmp_path.write_text(payload, encoding="utf-8")
     tmp_path.replace(path)
@@ -909,16 +975,13 @@ def _apply_config_form(data: dict, form) -> tuple[dict, Optional[str]]:
 
 
 def _validate_config_data(config_path: Path, data: dict) -> Optional[str]:
-    with tempfile.NamedTemporaryFile("w", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-        tmp.write(yaml.safe_dump(data, sort_keys=False))
+    # Validate the edited mapping directly instead of round-tripping it via YAML,
+    # with the same config.d and secrets overlays that load() applies.
+    loader = ConfigLoader(config_path=config_path)
     try:
-        loader = ConfigLoader(config_path=tmp_path)
-        loader.load()
+        loader.load_mapping(loader.merge_overlays(data))
     except ConfigError as exc:
         return str(exc)
-    finally:
-        tmp_path.unlink(missing_ok=True)
     return None
 
 
@@ -3,55 +3,106 @@ from __future__ import annotations
 from dataclasses import dataclass
 import logging
 import math
+import os
 from pathlib import Path
 import subprocess
-from typing import Optional, Protocol
+import threading
+from typing import Callable, Optional, Protocol
 
 from prayerhub.command_runner import CommandRunner
 
 
+_UNRESOLVED = object()
+
+
 class AudioDurationProbe(Protocol):
     def duration_seconds(self, path: Path) -> Optional[float]:
         ...
 
 
+def _parse_duration(out: str) -> Optional[float]:
+    # ffprobe prints one value per line and "N/A" for streams without a duration.
+    end = out.find("\n")
+    value = out[:end] if end != -1 else out
+    if not value or value == "N/A":
+        return None
+    try:
+        duration = float(value)
+    except ValueError:
+        return None
+    return duration if math.isfinite(duration) else None
+
+
 @dataclass
 class FfprobeDurationProbe:
     runner: CommandRunner
     timeout_seconds: int = 5
+    # Injectable so tests can simulate file changes without touching disk.
+    stat_fn: Callable[[Path], os.stat_result] = os.stat
 
     def __post_init__(self) -> None:
         self._logger = logging.getLogger(self.__class__.__name__)
         self._cache: dict[Path, tuple[tuple[int, int], float]] = {}
+        self._ffprobe_path: object = _UNRESOLVED
+        # One lock per path so concurrent cold lookups share a single ffprobe run.
+        self._locks: dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _resolve_ffprobe(self) -> Optional[str]:
+        # PATH does not change under a running service, so look it up only once.
+        if self._ffprobe_path is _UNRESOLVED:
+            self._ffprobe_path = self.runner.which("ffprobe")
+        return self._ffprobe_path
 
     def _stat_key(self, path: Path) -> Optional[tuple[int, int]]:
         try:
-            stat = path.stat()
+            stat = self.stat_fn(path)
         except OSError:
             return None
         return (stat.st_mtime_ns, stat.st_size)
 
+    def _cached(self, path: Path, stat_key: tuple[int, int]) -> Optional[float]:
+        cached = self._cache.get(path)
+        if cached and cached[0] == stat_key:
+            return cached[1]
+        return None
+
     def duration_seconds(self, path: Path) -> Optional[float]:
         self._logger.info("ffprobe requested for %s", path)
-        if not self.runner.which("ffprobe"):
-            self._logger.warning("ffprobe unavailable; skipping %s", path)
-            return None
+        # Consult the cache first so hits cost one stat and no PATH lookup.
         stat_key = self._stat_key(path)
-        if stat_key is not None:
-            cached = self._cache.get(path)
-            if cached and cached[0] == stat_key:
-                self._logger.info("ffprobe cache hit for %s", path)
-                return cached[1]
-            self._logger.info("ffprobe cache miss for %s", path)
-        else:
+        if stat_key is None:
             self._logger.warning("ffprobe cache disabled; stat failed for %s", path)
+            return self._probe(path, stat_key)
+        duration = self._cached(path, stat_key)
+        if duration is not None:
+            self._logger.info("ffprobe cache hit for %s", path)
+            return duration
+        self._logger.info("ffprobe cache miss for %s", path)
+        with self._locks_guard:
+            lock = self._locks.setdefault(path, threading.Lock())
+        with lock:
+            # Another caller may have probed this file while we waited.
+            duration = self._cached(path, stat_key)
+            if duration is not None:
+                self._logger.info("ffprobe cache hit for %s", path)
+                return duration
+            return self._probe(path, stat_key)
+
+    def _probe(
+        self, path: Path, stat_key: Optional[tuple[int, int]]
+    ) -> Optional[float]:
+        ffprobe = self._resolve_ffprobe()
+        if not ffprobe:
+            self._logger.warning("ffprobe unavailable; skipping %s", path)
+            return None
         try:
             self._logger.info(
                 "ffprobe running for %s (timeout=%ss)", path, self.timeout_seconds
             )
             result = self.runner.run(
                 [
-                    "ffprobe",
+                    ffprobe,
                     "-v",
                     "error",
                     "-show_entries",
@@ -72,11 +123,11 @@ class FfprobeDurationProbe:
                 result.stderr.strip(),
             )
             return None
-        raw = result.stdout.strip()
-        try:
-            duration = float(raw)
-        except ValueError:
-            self._logger.warning("Invalid ffprobe duration for %s: %s", path, raw)
+        duration = _parse_duration(result.stdout)
+        if duration is None:
+            self._logger.warning(
+                "Invalid ffprobe duration for %s: %s", path, result.stdout.strip()
+            )
             return None
         if duration <= 0:
             self._logger.warning("ffprobe returned non-positive duration for %s", path)
@@ -89,6 +140,163 @@ class FfprobeDurationProbe:
         return duration
 
 
+# Enough to cover the WAV chunk headers or the first MP3 frames after any ID3 tag.
+_HEADER_READ_BYTES = 64 * 1024
+
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),  # MPEG-2.5
+}
+_MP3_LAYER3_BITRATES_KBPS = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+
+@dataclass(frozen=True)
+class _Mp3Frame:
+    version: int
+    bitrate_bps: int
+    sample_rate: int
+    mono: bool
+    length: int
+
+    @property
+    def samples(self) -> int:
+        return 1152 if self.version == 3 else 576
+
+
+def _parse_mp3_frame(data: bytes, offset: int) -> Optional[_Mp3Frame]:
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset : offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    # Only Layer III is decoded here; anything else falls back to ffprobe.
+    if version == 1 or layer != 1 or rate_index == 3:
+        return None
+    if bitrate_index in (0, 15):
+        return None
+    bitrates = _MP3_LAYER3_BITRATES_KBPS[3 if version == 3 else 2]
+    bitrate_bps = bitrates[bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    coefficient = 144 if version == 3 else 72
+    length = coefficient * bitrate_bps // sample_rate + padding
+    return _Mp3Frame(
+        version=version,
+        bitrate_bps=bitrate_bps,
+        sample_rate=sample_rate,
+        mono=(b3 >> 6) == 3,
+        length=length,
+    )
+
+
+def _mp3_vbr_frame_count(data: bytes, offset: int, frame: _Mp3Frame) -> Optional[int]:
+    if frame.version == 3:
+        side_info = 17 if frame.mono else 32
+    else:
+        side_info = 9 if frame.mono else 17
+    xing = offset + 4 + side_info
+    if data[xing : xing + 4] in (b"Xing", b"Info"):
+        flags = int.from_bytes(data[xing + 4 : xing + 8], "big")
+        if flags & 0x01:
+            return int.from_bytes(data[xing + 8 : xing + 12], "big")
+        return None
+    vbri = offset + 4 + 32
+    if data[vbri : vbri + 4] == b"VBRI":
+        return int.from_bytes(data[vbri + 14 : vbri + 18], "big")
+    return None
+
+
+def _mp3_duration(handle, file_size: int) -> Optional[float]:
+    head = handle.read(10)
+    audio_start = 0
+    if head[:3] == b"ID3" and len(head) == 10:
+        tag_size = 0
+        for byte in head[6:10]:
+            tag_size = (tag_size << 7) | (byte & 0x7F)
+        footer = 10 if head[5] & 0x10 else 0
+        audio_start = 10 + tag_size + footer
+    handle.seek(audio_start)
+    data = handle.read(_HEADER_READ_BYTES)
+    # Only trust a frame right where the audio starts; scanning for a stray sync
+    # word misreads other containers (Ogg, M4A) as MP3.
+    frame = _parse_mp3_frame(data, 0)
+    if frame is None:
+        return None
+    following = data[frame.length : frame.length + 4]
+    if len(following) < 4:
+        handle.seek(audio_start + frame.length)
+        following = handle.read(4)
+    if _parse_mp3_frame(following, 0) is None:
+        return None
+    frame_count = _mp3_vbr_frame_count(data, 0, frame)
+    if frame_count:
+        return frame_count * frame.samples / frame.sample_rate
+    audio_bytes = file_size - audio_start
+    if file_size >= 128:
+        handle.seek(file_size - 128)
+        if handle.read(3) == b"TAG":
+            audio_bytes -= 128
+    if audio_bytes <= 0:
+        return None
+    return audio_bytes * 8 / frame.bitrate_bps
+
+
+def _wav_duration(data: bytes) -> Optional[float]:
+    byte_rate = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset : offset + 4]
+        chunk_size = int.from_bytes(data[offset + 4 : offset + 8], "little")
+        body = offset + 8
+        if chunk_id == b"fmt " and body + 12 <= len(data):
+            byte_rate = int.from_bytes(data[body + 8 : body + 12], "little")
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            return chunk_size / byte_rate
+        # RIFF chunks are padded to an even length.
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+@dataclass
+class HeaderDurationProbe:
+    fallback: Optional[AudioDurationProbe] = None
+
+    def __post_init__(self) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def duration_seconds(self, path: Path) -> Optional[float]:
+        duration = None
+        try:
+            with path.open("rb") as handle:
+                file_size = os.fstat(handle.fileno()).st_size
+                magic = handle.read(12)
+                if magic[:4] == b"RIFF" and magic[8:12] == b"WAVE":
+                    duration = _wav_duration(magic + handle.read(_HEADER_READ_BYTES))
+                else:
+                    handle.seek(0)
+                    duration = _mp3_duration(handle, file_size)
+        except OSError as exc:
+            self._logger.warning("Audio header unreadable for %s: %s", path, exc)
+        if duration is not None and duration > 0:
+            self._logger.info("Header duration for %s = %ss", path, duration)
+            return duration
+        if self.fallback is None:
+            self._logger.warning("Audio header duration unavailable for %s", path)
+            return None
+        self._logger.info("Audio header not recognised for %s; using fallback probe", path)
+        return self.fallback.duration_seconds(path)
+
+
 @dataclass
 class PlaybackTimeoutPolicy:
     strategy: str
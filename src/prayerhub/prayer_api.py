@@ -6,10 +6,21 @@ import time
 from typing import Any, Callable, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from prayerhub.prayer_times import ApiError
 
 
+def _pooled_session() -> requests.Session:
+    # Keep-alive pools sized for the concurrent per-date fallback; retries stay
+    # in PrayerApiClient so backoff and logging are handled in one place.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class PrayerApiClient:
     def __init__(
         self,
@@ -27,7 +38,7 @@ class PrayerApiClient:
         self._max_retries = max(0, int(max_retries))
         self._backoff_base_seconds = max(0.0, float(backoff_base_seconds))
         self._sleep = sleep
-        self._session = session or requests.Session()
+        self._session = session or _pooled_session()
         self._logger = logging.getLogger(self.__class__.__name__)
 
     def get_date(self, *, madhab: str, city: str, day: date) -> Dict[str, Any]:
@@ -1,23 +1,28 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
 import logging
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 
 from prayerhub.cache_store import CacheStore
 
 
+_PER_DATE_WORKERS = 8
+
+
 class ApiError(RuntimeError):
     """Raised when the prayer API request fails or returns unusable data."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DayPlan:
     date: date
     madhab: str
     city: str
-    times: Dict[str, str]
+    times: Mapping[str, str]
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -28,6 +33,13 @@ class DayPlan:
         }
 
 
+@lru_cache(maxsize=512)
+def _parse_plan_date(raw_date: str) -> date:
+    # The same dates come back from prefetch, cache reads and refreshes; DayPlan
+    # itself is not cached because its times dict is mutable.
+    return datetime.strptime(raw_date, "%Y-%m-%d").date()
+
+
 def day_plan_from_api(payload: Dict[str, Any]) -> DayPlan:
     # We keep parsing strict so we surface upstream schema issues early.
     try:
@@ -40,7 +52,7 @@ def day_plan_from_api(payload: Dict[str, Any]) -> DayPlan:
     if not isinstance(times, dict):
         raise ApiError("API payload 'times' must be a mapping")
     return DayPlan(
-        date=datetime.strptime(raw_date, "%Y-%m-%d").date(),
+        date=_parse_plan_date(raw_date),
         madhab=madhab,
         city=city,
         times=dict(times),
@@ -123,18 +135,24 @@ class PrayerTimeService:
         return day_plan_from_api(cached)
 
     def _fetch_per_date(self, start: date, days: int) -> List[DayPlan]:
-        plans: List[DayPlan] = []
-        for offset in range(days):
-            current = start + timedelta(days=offset)
-            try:
-                payload = self._api_client.get_date(
-                    madhab=self._madhab, city=self._city, day=current
-                )
-                plans.append(day_plan_from_api(payload))
-            except ApiError as exc:
-                # Continue so a single missing date does not stop the loop.
-                self._logger.warning("Date fetch failed for %s: %s", current, exc)
-        return plans
+        if days <= 0:
+            return []
+        dates = [start + timedelta(days=offset) for offset in range(days)]
+        # Per-date calls are latency bound, so overlap them; map keeps date order.
+        with ThreadPoolExecutor(max_workers=min(_PER_DATE_WORKERS, days)) as executor:
+            fetched = list(executor.map(self._fetch_date, dates))
+        return [plan for plan in fetched if plan is not None]
+
+    def _fetch_date(self, current: date) -> Optional[DayPlan]:
+        try:
+            payload = self._api_client.get_date(
+                madhab=self._madhab, city=self._city, day=current
+            )
+            return day_plan_from_api(payload)
+        except ApiError as exc:
+            # Continue so a single missing date does not stop the others.
+            self._logger.warning("Date fetch failed for %s: %s", current, exc)
+            return None
 
     def _derive_missing_extras(self, plans: Iterable[DayPlan]) -> List[DayPlan]:
         plans_list = list(plans)
@@ -213,6 +231,17 @@ def _derive_extras(plan: DayPlan, next_plan: Optional[DayPlan]) -> DayPlan:
     )
 
 
+def parse_hhmm(hhmm: str) -> tuple[int, int]:
+    # Split by hand; strptime is far slower per call. Like strptime's %H:%M we
+    # accept one- or two-digit fields, so "5:07" stays valid.
+    hour_str, sep, minute_str = hhmm.partition(":")
+    fields_ok = 1 <= len(hour_str) <= 2 and 1 <= len(minute_str) <= 2
+    digits = hour_str + minute_str
+    if not sep or not fields_ok or not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f"Time must be in HH:MM format: {hhmm!r}")
+    return int(hour_str), int(minute_str)
+
+
 def _combine(day: date, hhmm: str) -> datetime:
     # We treat API times as local wall-clock times without a timezone offset.
-    return datetime.strptime(f"{day.isoformat()} {hhmm}", "%Y-%m-%d %H:%M")
+    return datetime.combine(day, time(*parse_hhmm(hhmm)))
@@ -3,24 +3,41 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date, datetime, time
 import logging
-from typing import Callable
+from typing import AbstractSet, Callable, Iterable, Optional
 
+from apscheduler.job import Job
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 
-from prayerhub.prayer_times import DayPlan
+from prayerhub.prayer_times import DayPlan, parse_hhmm
 
 
 Handler = Callable[[DayPlan, str], None]
 
 
+def date_suffix(day: date) -> str:
+    # Shared by the event and test job IDs. Plain integer formatting skips
+    # strftime's locale-aware path.
+    return f"{day.year:04d}{day.month:02d}{day.day:02d}"
+
+
+def _is_unchanged(job: Optional[Job], run_at: datetime, args: list[object]) -> bool:
+    # Pending jobs on a scheduler that has not started yet have no run time.
+    next_run = getattr(job, "next_run_time", None)
+    if next_run is None:
+        return False
+    return next_run.replace(tzinfo=None) == run_at and list(job.args) == args
+
+
 @dataclass
 class JobScheduler:
     scheduler: BackgroundScheduler
     handler: Handler
     now_provider: Callable[[], datetime] = datetime.now
     misfire_grace_seconds: int = 60
+    # A refresh that slept through its slot is still worth running within the hour.
+    refresh_misfire_grace_seconds: int = 3600
 
     def __post_init__(self) -> None:
         self._logger = logging.getLogger(self.__class__.__name__)
@@ -31,35 +48,35 @@ class JobScheduler:
             self.scheduler.start()
 
     def schedule_day(self, plan: DayPlan, *, quran_times: Optional[Iterable[str]] = None) -> None:
-        self._remove_jobs_for_date(plan.date)
+        now = self.now_provider()
+        planned: list[tuple[str, datetime, str]] = []
         for name, hhmm in sorted(plan.times.items()):
             run_at = self._combine(plan.date, hhmm)
-            if run_at <= self.now_provider():
+            if run_at <= now:
                 # Skip past events so we never fire on stale data.
                 continue
-            job_id = self._job_id(name, plan.date)
-            self.scheduler.add_job(
-                self.handler,
-                trigger=DateTrigger(run_date=run_at),
-                id=job_id,
-                args=[plan, name],
-                replace_existing=True,
-                misfire_grace_time=self.misfire_grace_seconds,
-                coalesce=True,
-                max_instances=1,
-            )
-            self._logger.info("Scheduled %s at %s", job_id, run_at)
-
+            planned.append((self._job_id(name, plan.date), run_at, name))
         for hhmm in sorted(quran_times or []):
             run_at = self._combine(plan.date, hhmm)
-            if run_at <= self.now_provider():
+            if run_at <= now:
+                continue
+            planned.append((self._quran_job_id(plan.date, hhmm), run_at, f"quran@{hhmm}"))
+
+        # Jobs being rescheduled are swapped in place by replace_existing, so
+        # only the ones dropping out of the plan need a separate removal.
+        existing = self._remove_jobs_for_date(
+            plan.date, keep={job_id for job_id, _, _ in planned}
+        )
+        for job_id, run_at, event in planned:
+            if _is_unchanged(existing.get(job_id), run_at, [plan, event]):
+                # Daily refreshes mostly return the same times; leave those jobs be.
+                self._logger.info("Keeping %s at %s", job_id, run_at)
                 continue
-            job_id = self._quran_job_id(plan.date, hhmm)
             self.scheduler.add_job(
                 self.handler,
                 trigger=DateTrigger(run_date=run_at),
                 id=job_id,
-                args=[plan, f"quran@{hhmm}"],
+                args=[plan, event],
                 replace_existing=True,
                 misfire_grace_time=self.misfire_grace_seconds,
                 coalesce=True,
@@ -74,7 +91,7 @@ class JobScheduler:
             trigger=CronTrigger(hour=hour, minute=minute),
             id="refresh_daily",
             replace_existing=True,
-            misfire_grace_time=self.misfire_grace_seconds,
+            misfire_grace_time=self.refresh_misfire_grace_seconds,
             coalesce=True,
             max_instances=1,
         )
@@ -84,23 +101,31 @@ class JobScheduler:
         # This method is intended to be injected or overridden by the app layer.
         self._logger.warning("refresh_and_reschedule is not configured")
 
-    def _remove_jobs_for_date(self, day: date) -> None:
-        suffix = day.strftime("%Y%m%d")
+    def _remove_jobs_for_date(
+        self, day: date, *, keep: AbstractSet[str] = frozenset()
+    ) -> dict[str, Job]:
+        # Returns the kept jobs so callers can skip re-adding unchanged ones.
+        suffix = date_suffix(day)
+        kept: dict[str, Job] = {}
         for job in self.scheduler.get_jobs():
-            if job.id.endswith(suffix):
-                # Clearing by suffix avoids stale jobs accumulating over time.
-                self._logger.info("Removing job %s", job.id)
-                self.scheduler.remove_job(job.id)
+            if not job.id.endswith(suffix):
+                continue
+            if job.id in keep:
+                kept[job.id] = job
+                continue
+            # Clearing by suffix avoids stale jobs accumulating over time.
+            self._logger.info("Removing job %s", job.id)
+            self.scheduler.remove_job(job.id)
+        return kept
 
     def _job_id(self, name: str, day: date) -> str:
-        return f"event_{name}_{day.strftime('%Y%m%d')}"
+        return f"event_{name}_{date_suffix(day)}"
 
     def _quran_job_id(self, day: date, hhmm: str) -> str:
         # Quran jobs keep the time in the ID for easier tracking in status views.
         compact = hhmm.replace(":", "")
-        return f"quran_{day.strftime('%Y%m%d')}_{compact}"
+        return f"quran_{date_suffix(day)}_{compact}"
 
     def _combine(self, day: date, hhmm: str) -> datetime:
         # We store times as local wall-clock HH:MM strings.
-        hh, mm = hhmm.split(":")
-        return datetime.combine(day, time(int(hh), int(mm)))
+        return datetime.combine(day, time(*parse_hhmm(hhmm)))
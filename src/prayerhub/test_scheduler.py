@@ -8,6 +8,8 @@ from typing import Callable, List
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.date import DateTrigger
 
+from prayerhub.scheduler import date_suffix
+
 
 Handler = Callable[[], None]
 
@@ -96,4 +98,4 @@ class TestScheduleService:
 
     def _job_id(self, run_at: datetime) -> str:
         # Job IDs are derived from time so they remain stable in status views.
-        return f"{self.job_prefix}_{run_at.strftime('%Y%m%d%H%M')}"
+        return f"{self.job_prefix}_{date_suffix(run_at)}{run_at.hour:02d}{run_at.minute:02d}"
@@ -1,5 +1,12 @@
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
+from typing import Callable, Iterator
+
+import pytest
+from apscheduler.schedulers.background import BackgroundScheduler
 
 
 def pytest_sessionstart(session):
@@ -8,3 +15,90 @@ def pytest_sessionstart(session):
     src_path = repo_root / "src"
     if str(src_path) not in sys.path:
         sys.path.insert(0, str(src_path))
+
+
+@pytest.fixture(scope="module")
+def _module_scheduler() -> Iterator[BackgroundScheduler]:
+    # Starting a scheduler spins up a thread and executors; one per module is plenty.
+    scheduler = BackgroundScheduler()
+    scheduler.start(paused=True)
+    yield scheduler
+    scheduler.shutdown(wait=False)
+
+
+@pytest.fixture
+def paused_scheduler(_module_scheduler: BackgroundScheduler) -> Iterator[BackgroundScheduler]:
+    yield _module_scheduler
+    _module_scheduler.remove_all_jobs()
+
+
+# Every audio file the test configs reference, seeded under one shared layout.
+_AUDIO_NAMES: tuple[str, ...] = (
+    "test_beep.mp3",
+    "connected.mp3",
+    "keepalive_low_freq.mp3",
+    "adhan_fajr.mp3",
+    "adhan_dhuhr.mp3",
+    "adhan_asr.mp3",
+    "adhan_maghrib.mp3",
+    "adhan_isha.mp3",
+    "quran_morning.mp3",
+    "sunrise.mp3",
+    "sunset.mp3",
+    "midnight.mp3",
+    "tahajjud.mp3",
+)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        pass
+    except OSError:
+        # Hardlinks are unavailable on some filesystems; copy instead.
+        shutil.copyfile(source, target)
+
+
+@pytest.fixture(scope="session")
+def audio_names() -> tuple[str, ...]:
+    """Every audio file name that seed_audio creates."""
+    return _AUDIO_NAMES
+
+
+@pytest.fixture(scope="session")
+def audio_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build the audio files once per session; seed_audio links them into place."""
+    root = tmp_path_factory.getbasetemp()
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        # xdist workers get sibling basetemps, so share one template above them.
+        root = root.parent
+    template = root / "audio_template"
+    if template.is_dir():
+        return template
+    staging = Path(tempfile.mkdtemp(prefix="audio_template.", dir=root))
+    first, *rest = _AUDIO_NAMES
+    (staging / first).write_bytes(b"beep")
+    # The tests only read these files, so they can all share one inode.
+    for name in rest:
+        _link_or_copy(staging / first, staging / name)
+    try:
+        # The rename is atomic, so concurrent workers never see a partial template.
+        os.rename(staging, template)
+    except OSError:
+        # Another worker won the race; use its template.
+        shutil.rmtree(staging, ignore_errors=True)
+    return template
+
+
+@pytest.fixture(scope="session")
+def seed_audio(audio_template: Path) -> Callable[[Path], Path]:
+    """Return a function that seeds every audio file into a directory and returns it."""
+
+    def seed(audio_dir: Path) -> Path:
+        os.makedirs(audio_dir, exist_ok=True)
+        for name in _AUDIO_NAMES:
+            _link_or_copy(audio_template / name, audio_dir / name)
+        return audio_dir
+
+    return seed
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import os
 from pathlib import Path
+from typing import Callable
 
 from prayerhub.app import _config_summary, _prewarm_duration_cache, main
 from prayerhub.config import (
@@ -90,30 +90,12 @@ logging:
 """
 
 
-def _seed_audio_files(root: Path) -> None:
-    audio_dir = root / "data" / "audio"
-    audio_dir.mkdir(parents=True, exist_ok=True)
-    for name in [
-        "connected.mp3",
-        "keepalive_low_freq.mp3",
-        "adhan_fajr.mp3",
-        "adhan_dhuhr.mp3",
-        "adhan_asr.mp3",
-        "adhan_maghrib.mp3",
-        "adhan_isha.mp3",
-        "quran_morning.mp3",
-        "sunrise.mp3",
-        "sunset.mp3",
-        "midnight.mp3",
-        "tahajjud.mp3",
-    ]:
-        (audio_dir / name).write_bytes(b"beep")
-
-
-def test_app_respects_prayerhub_config_dir(tmp_path: Path, monkeypatch) -> None:
+def test_app_respects_prayerhub_config_dir(
+    tmp_path: Path, monkeypatch, seed_audio: Callable[[Path], Path]
+) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
     _write_yaml(tmp_path / "config.yml", _base_config("test_beep.mp3"))
 
     monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
@@ -125,10 +107,12 @@ def test_app_respects_prayerhub_config_dir(tmp_path: Path, monkeypatch) -> None:
     assert exit_code == 0
 
 
-def test_app_uses_explicit_config_path(tmp_path: Path, monkeypatch) -> None:
+def test_app_uses_explicit_config_path(
+    tmp_path: Path, monkeypatch, seed_audio: Callable[[Path], Path]
+) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
     config_path = tmp_path / "custom.yml"
     _write_yaml(config_path, _base_config("test_beep.mp3"))
 
@@ -140,10 +124,12 @@ def test_app_uses_explicit_config_path(tmp_path: Path, monkeypatch) -> None:
     assert exit_code == 0
 
 
-def test_scheduler_starts_with_control_panel_enabled(tmp_path: Path, monkeypatch) -> None:
+def test_scheduler_starts_with_control_panel_enabled(
+    tmp_path: Path, monkeypatch, seed_audio: Callable[[Path], Path]
+) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
     config_path = tmp_path / "config.yml"
     config_text = _base_config("test_beep.mp3").replace(
         "control_panel:\n  enabled: false",
@@ -209,9 +195,11 @@ def test_scheduler_starts_with_control_panel_enabled(tmp_path: Path, monkeypatch
     assert started["value"] is True
 
 
-def test_app_exits_cleanly_on_config_error(tmp_path: Path, monkeypatch) -> None:
+def test_app_exits_cleanly_on_config_error(
+    tmp_path: Path, monkeypatch, seed_audio: Callable[[Path], Path]
+) -> None:
     _write_yaml(tmp_path / "config.yml", _base_config("missing.mp3"))
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
 
     monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
     monkeypatch.setenv("PRAYERHUB_CACHE_DIR", str(tmp_path / "cache"))
@@ -222,10 +210,12 @@ def test_app_exits_cleanly_on_config_error(tmp_path: Path, monkeypatch) -> None:
     assert exit_code != 0
 
 
-def test_config_summary_redacts_password_hash(tmp_path: Path, monkeypatch) -> None:
+def test_config_summary_redacts_password_hash(
+    tmp_path: Path, monkeypatch, seed_audio: Callable[[Path], Path]
+) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
     _write_yaml(tmp_path / "config.yml", _base_config("test_beep.mp3"))
 
     monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
@@ -247,25 +237,8 @@ class FakeDurationProbe:
         return 1.0
 
 
-def _audio_config(tmp_path: Path) -> AudioConfig:
-    audio_dir = tmp_path / "data" / "audio"
-    audio_dir.mkdir(parents=True, exist_ok=True)
-    for name in [
-        "test_beep.mp3",
-        "connected.mp3",
-        "keepalive_low_freq.mp3",
-        "adhan_fajr.mp3",
-        "adhan_dhuhr.mp3",
-        "adhan_asr.mp3",
-        "adhan_maghrib.mp3",
-        "adhan_isha.mp3",
-        "quran_morning.mp3",
-        "sunrise.mp3",
-        "sunset.mp3",
-        "midnight.mp3",
-        "tahajjud.mp3",
-    ]:
-        (audio_dir / name).write_bytes(b"beep")
+def _audio_config(tmp_path: Path, seed_audio: Callable[[Path], Path]) -> AudioConfig:
+    seed_audio(tmp_path / "data" / "audio")
     return AudioConfig(
         test_audio="data/audio/test_beep.mp3",
         connected_tone="data/audio/connected.mp3",
@@ -308,10 +281,14 @@ def _audio_config(tmp_path: Path) -> AudioConfig:
 
 
 def test_prewarm_duration_cache_probes_audio_files(
-    tmp_path: Path, monkeypatch, caplog
+    tmp_path: Path,
+    monkeypatch,
+    caplog,
+    audio_names: tuple[str, ...],
+    seed_audio: Callable[[Path], Path],
 ) -> None:
     monkeypatch.chdir(tmp_path)
-    audio = _audio_config(tmp_path)
+    audio = _audio_config(tmp_path, seed_audio)
     probe = FakeDurationProbe()
 
     with caplog.at_level("INFO"):
@@ -319,20 +296,6 @@ def test_prewarm_duration_cache_probes_audio_files(
 
     assert probe.calls
     call_set = {path.name for path in probe.calls}
-    assert {
-        "test_beep.mp3",
-        "connected.mp3",
-        "keepalive_low_freq.mp3",
-        "adhan_fajr.mp3",
-        "adhan_dhuhr.mp3",
-        "adhan_asr.mp3",
-        "adhan_maghrib.mp3",
-        "adhan_isha.mp3",
-        "quran_morning.mp3",
-        "sunrise.mp3",
-        "sunset.mp3",
-        "midnight.mp3",
-        "tahajjud.mp3",
-    }.issubset(call_set)
+    assert set(audio_names).issubset(call_set)
     assert "Prewarming audio durations" in caplog.text
     assert "Prewarm complete" in caplog.text
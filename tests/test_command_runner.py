@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from prayerhub.command_runner import SubprocessCommandRunner
+
+
+def test_run_kills_child_on_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    # subprocess.run must reap a hung child (e.g. ffprobe) rather than leak it.
+    killed: list[subprocess.Popen] = []
+    original_kill = subprocess.Popen.kill
+
+    def record_kill(proc: subprocess.Popen) -> None:
+        killed.append(proc)
+        original_kill(proc)
+
+    monkeypatch.setattr(subprocess.Popen, "kill", record_kill)
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        SubprocessCommandRunner().run(
+            [sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2
+        )
+
+    assert len(killed) == 1
+    assert killed[0].returncode is not None
+    assert killed[0].stdout.closed
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import io
 from pathlib import Path
+from typing import Callable
+import re
 
 import pytest
+import yaml
 
 from prayerhub.config import ConfigError, ConfigLoader
 
@@ -12,28 +16,7 @@ def _write_yaml(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
 
-def _seed_audio_files(root: Path) -> None:
-    audio_dir = root / "data" / "audio"
-    audio_dir.mkdir(parents=True, exist_ok=True)
-    for name in [
-        "connected.mp3",
-        "keepalive_low_freq.mp3",
-        "adhan_fajr.mp3",
-        "adhan_dhuhr.mp3",
-        "adhan_asr.mp3",
-        "adhan_maghrib.mp3",
-        "adhan_isha.mp3",
-        "quran_morning.mp3",
-        "sunrise.mp3",
-        "sunset.mp3",
-        "midnight.mp3",
-        "tahajjud.mp3",
-    ]:
-        (audio_dir / name).write_bytes(b"beep")
-
-
-def _base_config(test_audio_path: str) -> str:
-    return f"""
+_BASE_CONFIG_TEMPLATE = """
 location:
   city: "colombo"
   madhab: "shafi"
@@ -46,7 +29,7 @@ api:
   prefetch_days: 7
 
 audio:
-  test_audio: "{test_audio_path}"
+  test_audio: "__TEST_AUDIO__"
   connected_tone: "data/audio/connected.mp3"
   background_keepalive_enabled: false
   background_keepalive_path: "data/audio/keepalive_low_freq.mp3"
@@ -103,10 +86,33 @@ logging:
 """
 
 
-def test_loads_base_and_overlays_config_d_in_order(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+def _base_config(test_audio_path: str) -> str:
+    return _BASE_CONFIG_TEMPLATE.replace("__TEST_AUDIO__", test_audio_path)
+
+
+_KEY_LINE_RE = re.compile(r"^(?P<indent> *)(?P<key>\w+):.*\n", re.MULTILINE)
+
+
+def _patch(text: str, **values: str | None) -> str:
+    # Rewrite the named keys in one pass; None drops the line entirely.
+    def _replace(match: re.Match[str]) -> str:
+        key = match["key"]
+        if key not in values:
+            return match[0]
+        value = values[key]
+        if value is None:
+            return ""
+        return f"{match['indent']}{key}: {value}\n"
+
+    return _KEY_LINE_RE.sub(_replace, text)
+
+
+def test_loads_base_and_overlays_config_d_in_order(
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
+) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
 
     _write_yaml(tmp_path / "config.yml", _base_config(str(test_audio)))
     _write_yaml(
@@ -124,237 +130,195 @@ location:
 """,
     )
 
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
-    monkeypatch.chdir(tmp_path)
-    config = ConfigLoader().load()
+    config = ConfigLoader(root_dir=tmp_path, base_dir=tmp_path).load()
 
     assert config.location.city == "kandy"
     assert config.logging.file_path == "logs/prayerhub.log"
 
 
-def test_audio_timeout_defaults_when_missing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+def test_audio_timeout_defaults_when_missing(
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
+) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
-    config_text = _base_config(str(test_audio)).replace(
-        '  playback_timeout_strategy: "fixed"\n', ""
-    ).replace(
-        "  playback_timeout_buffer_seconds: 5\n", ""
+    seed_audio(tmp_path / "data" / "audio")
+    config_text = _patch(
+        _base_config(str(test_audio)),
+        playback_timeout_strategy=None,
+        playback_timeout_buffer_seconds=None,
     )
-    _write_yaml(tmp_path / "config.yml", config_text)
 
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
-    monkeypatch.chdir(tmp_path)
-    config = ConfigLoader().load()
+    config = ConfigLoader(base_dir=tmp_path).load_from_stream(io.StringIO(config_text))
 
     assert config.audio.playback_timeout_strategy == "auto"
     assert config.audio.playback_timeout_buffer_seconds == 5
 
 
-def test_ffprobe_timeout_defaults_when_missing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+def test_ffprobe_timeout_defaults_when_missing(
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
+) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
-    config_text = _base_config(str(test_audio)).replace(
-        "  ffprobe_timeout_seconds: 5\n", ""
-    )
-    _write_yaml(tmp_path / "config.yml", config_text)
+    seed_audio(tmp_path / "data" / "audio")
+    config_text = _patch(_base_config(str(test_audio)), ffprobe_timeout_seconds=None)
 
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
-    monkeypatch.chdir(tmp_path)
-    config = ConfigLoader().load()
+    config = ConfigLoader(base_dir=tmp_path).load_from_stream(io.StringIO(config_text))
 
     assert config.audio.ffprobe_timeout_seconds == 5
 
 
 def test_invalid_ffprobe_timeout_fails_validation(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
 ) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
-    config_text = _base_config(str(test_audio)).replace(
-        "  ffprobe_timeout_seconds: 5",
-        "  ffprobe_timeout_seconds: 0",
-    )
-    _write_yaml(tmp_path / "config.yml", config_text)
-
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
-    monkeypatch.chdir(tmp_path)
-
-    with pytest.raises(ConfigError):
-        ConfigLoader().load()
-
-
-def test_missing_test_audio_path_fails_validation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    missing_audio = "missing.mp3"
-    _write_yaml(tmp_path / "config.yml", _base_config(missing_audio))
-
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
-    monkeypatch.chdir(tmp_path)
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
+    config_text = _patch(_base_config(str(test_audio)), ffprobe_timeout_seconds="0")
 
     with pytest.raises(ConfigError):
-        ConfigLoader().load()
-
-
-def test_missing_background_keepalive_path_fails_validation(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        ConfigLoader(base_dir=tmp_path).load_from_stream(io.StringIO(config_text))
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"test_audio": '"missing.mp3"'},
+        {"fajr": '"adhan_fajr.mp3"', "dhuhr": '"missing.mp3"'},
+        {"file": '"missing_quran.mp3"', "fajr": '"adhan_fajr.mp3"'},
+        {"sunrise": '"missing_sunrise.mp3"', "fajr": '"adhan_fajr.mp3"'},
+    ],
+    ids=["test_audio", "adhan", "quran", "notification"],
+)
+def test_missing_audio_path_fails_validation(
+    tmp_path: Path,
+    overrides: dict[str, str],
+    seed_audio: Callable[[Path], Path],
 ) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
-
-    config_text = _base_config("test_beep.mp3").replace(
-        "background_keepalive_enabled: false",
-        "background_keepalive_enabled: true",
-    ).replace(
-        'background_keepalive_path: "data/audio/keepalive_low_freq.mp3"',
-        'background_keepalive_path: "missing_keepalive.mp3"',
-    )
-    _write_yaml(tmp_path / "config.yml", config_text)
+    seed_audio(tmp_path / "data" / "audio")
 
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
-    monkeypatch.chdir(tmp_path)
+    config_text = _patch(_base_config("test_beep.mp3"), **overrides)
 
     with pytest.raises(ConfigError):
-        ConfigLoader().load()
+        ConfigLoader(base_dir=tmp_path).load_from_stream(io.StringIO(config_text))
 
 
-def test_invalid_background_keepalive_cycle_range_fails_validation(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+def test_dangling_audio_symlink_fails_validation(
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
 ) -> None:
-    test_audio = tmp_path / "test_beep.mp3"
-    test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
-
-    config_text = _base_config("test_beep.mp3").replace(
-        "background_keepalive_volume_cycle_enabled: false",
-        "background_keepalive_volume_cycle_enabled: true",
-    ).replace(
-        "background_keepalive_volume_cycle_min_percent: 1",
-        "background_keepalive_volume_cycle_min_percent: 20",
-    ).replace(
-        "background_keepalive_volume_cycle_max_percent: 10",
-        "background_keepalive_volume_cycle_max_percent: 5",
-    )
-    _write_yaml(tmp_path / "config.yml", config_text)
+    (tmp_path / "test_beep.mp3").symlink_to(tmp_path / "gone.mp3")
+    seed_audio(tmp_path / "data" / "audio")
 
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
-    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ConfigError, match="test_audio"):
+        ConfigLoader(base_dir=tmp_path).load_from_stream(
+            io.StringIO(_base_config("test_beep.mp3"))
+        )
 
-    with pytest.raises(ConfigError):
-        ConfigLoader().load()
 
-
-def test_missing_adhan_audio_path_fails_validation(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+def test_missing_background_keepalive_path_fails_validation(
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
 ) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
 
-    config_text = _base_config("test_beep.mp3").replace(
-        'fajr: "data/audio/adhan_fajr.mp3"', 'fajr: "adhan_fajr.mp3"'
-    ).replace(
-        'dhuhr: "data/audio/adhan_dhuhr.mp3"', 'dhuhr: "missing.mp3"'
+    config_text = _patch(
+        _base_config("test_beep.mp3"),
+        background_keepalive_enabled="true",
+        background_keepalive_path='"missing_keepalive.mp3"',
     )
-    _write_yaml(tmp_path / "config.yml", config_text)
-
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
-    monkeypatch.chdir(tmp_path)
 
     with pytest.raises(ConfigError):
-        ConfigLoader().load()
+        ConfigLoader(base_dir=tmp_path).load_from_stream(io.StringIO(config_text))
 
 
-def test_missing_quran_audio_path_fails_validation(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+def test_invalid_background_keepalive_cycle_range_fails_validation(
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
 ) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
 
-    config_text = _base_config("test_beep.mp3").replace(
-        'file: "data/audio/quran_morning.mp3"', 'file: "missing_quran.mp3"'
-    ).replace(
-        'fajr: "data/audio/adhan_fajr.mp3"', 'fajr: "adhan_fajr.mp3"'
+    config_text = _patch(
+        _base_config("test_beep.mp3"),
+        background_keepalive_volume_cycle_enabled="true",
+        background_keepalive_volume_cycle_min_percent="20",
+        background_keepalive_volume_cycle_max_percent="5",
     )
-    _write_yaml(tmp_path / "config.yml", config_text)
-
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
-    monkeypatch.chdir(tmp_path)
 
     with pytest.raises(ConfigError):
-        ConfigLoader().load()
+        ConfigLoader(base_dir=tmp_path).load_from_stream(io.StringIO(config_text))
 
 
-def test_missing_notification_audio_path_fails_validation(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+def test_relative_audio_path_resolves_from_cwd(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, seed_audio: Callable[[Path], Path]
 ) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
 
-    config_text = _base_config("test_beep.mp3").replace(
-        'sunrise: "data/audio/sunrise.mp3"', 'sunrise: "missing_sunrise.mp3"'
-    ).replace(
-        'fajr: "data/audio/adhan_fajr.mp3"', 'fajr: "adhan_fajr.mp3"'
-    )
-    _write_yaml(tmp_path / "config.yml", config_text)
+    _write_yaml(tmp_path / "config.yml", _base_config("test_beep.mp3"))
 
     monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
     monkeypatch.chdir(tmp_path)
 
-    with pytest.raises(ConfigError):
-        ConfigLoader().load()
+    config = ConfigLoader().load()
+    assert config.audio.test_audio == "test_beep.mp3"
 
 
-def test_relative_audio_path_resolves_from_cwd(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+def test_relative_audio_path_resolves_from_base_dir(
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
 ) -> None:
-    test_audio = tmp_path / "test_beep.mp3"
-    test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    base_dir = tmp_path / "app"
+    base_dir.mkdir()
+    (base_dir / "test_beep.mp3").write_bytes(b"beep")
+    seed_audio(base_dir / "data" / "audio")
 
     _write_yaml(tmp_path / "config.yml", _base_config("test_beep.mp3"))
 
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
-    monkeypatch.chdir(tmp_path)
-
-    config = ConfigLoader().load()
-    assert config.audio.test_audio == "test_beep.mp3"
+    config = ConfigLoader(root_dir=tmp_path, base_dir=base_dir).load()
+    # Stored paths are resolved too, so playback does not depend on the cwd.
+    assert config.audio.test_audio == str(base_dir / "test_beep.mp3")
+    assert config.audio.adhan.fajr == str(base_dir / "data/audio/adhan_fajr.mp3")
 
 
 def test_missing_control_panel_password_hash_fails_validation(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
 ) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
 
-    config_text = _base_config(str(test_audio)).replace(
-        'password_hash: "pbkdf2:sha256:..."', ""
-    )
-    _write_yaml(tmp_path / "config.yml", config_text)
-
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
+    config_text = _patch(_base_config(str(test_audio)), password_hash=None)
 
     with pytest.raises(ConfigError):
-        ConfigLoader().load()
+        ConfigLoader(base_dir=tmp_path).load_from_stream(io.StringIO(config_text))
 
 
 def test_volume_percent_out_of_range_fails_validation(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
 ) -> None:
     test_audio = tmp_path / "test_beep.mp3"
     test_audio.write_bytes(b"beep")
-    _seed_audio_files(tmp_path)
+    seed_audio(tmp_path / "data" / "audio")
 
-    config_text = _base_config(str(test_audio)).replace("master_percent: 60", "master_percent: 101")
-    _write_yaml(tmp_path / "config.yml", config_text)
+    config_text = _patch(_base_config(str(test_audio)), master_percent="101")
 
-    monkeypatch.setenv("PRAYERHUB_CONFIG_DIR", str(tmp_path))
+    with pytest.raises(ConfigError):
+        ConfigLoader(base_dir=tmp_path).load_from_stream(io.StringIO(config_text))
+
+
+def test_load_mapping_validates_without_config_files(
+    tmp_path: Path, seed_audio: Callable[[Path], Path]
+) -> None:
+    (tmp_path / "test_beep.mp3").write_bytes(b"beep")
+    seed_audio(tmp_path / "data" / "audio")
+    data = yaml.safe_load(_base_config("test_beep.mp3"))
+
+    config = ConfigLoader(root_dir=tmp_path / "absent", base_dir=tmp_path).load_mapping(data)
+    assert config.location.city == "colombo"
 
+    data["audio"]["volumes"]["master_percent"] = 101
     with pytest.raises(ConfigError):
-        ConfigLoader().load()
+        ConfigLoader(base_dir=tmp_path).load_mapping(data)
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import date, datetime
+import os
 from pathlib import Path
+import re
+import shutil
+import string
 import subprocess
-from typing import Callable
+import sys
+from types import MappingProxyType
+from typing import Any, Callable
 
+import pytest
 from apscheduler.schedulers.background import BackgroundScheduler
+from flask.testing import FlaskClient
 from werkzeug.security import generate_password_hash
 
-from prayerhub.control_panel import ControlPanelServer
+from prayerhub.control_panel import ControlPanelServer, _read_log_entries
 from prayerhub.prayer_times import DayPlan
 from prayerhub.test_scheduler import TestScheduleService
 
@@ -21,6 +30,50 @@ class FixedNow:
         return self._now
 
 
+@dataclass(slots=True)
+class FakeJob:
+    id: str
+    func: Callable[..., Any]
+    trigger: Any
+    next_run_time: datetime | None
+    replace_existing: bool
+
+
+class FakeScheduler:
+    def __init__(self) -> None:
+        self.jobs: dict[str, FakeJob] = {}
+
+    def add_job(self, func, *, trigger, id, run_date=None, replace_existing=False, **_kwargs):
+        # Date triggers carry the run time; string triggers pass it explicitly.
+        if run_date is None:
+            run_date = trigger.run_date
+        self.jobs[id] = FakeJob(
+            id=id,
+            func=func,
+            trigger=trigger,
+            next_run_time=run_date,
+            replace_existing=replace_existing,
+        )
+
+    def get_jobs(self):
+        return list(self.jobs.values())
+
+    def get_job(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    def remove_job(self, job_id: str) -> None:
+        self.jobs.pop(job_id, None)
+
+    def remove_all_jobs(self) -> None:
+        self.jobs.clear()
+
+    def start(self, *, paused: bool = False) -> None:
+        return None
+
+    def shutdown(self, wait: bool = True) -> None:
+        return None
+
+
 class FakeRouter:
     def __init__(self) -> None:
         self.calls: list[int] = []
@@ -51,8 +104,17 @@ class FakeRunner:
         return None
 
 
+# Shared by tests, so the times mapping is read-only.
+_DEFAULT_PLAN = DayPlan(
+    date=date(2025, 1, 1),
+    madhab="shafi",
+    city="colombo",
+    times=MappingProxyType({"fajr": "05:05", "dhuhr": "12:10"}),
+)
+
+
 class FakePrayerService:
-    def __init__(self, plan: DayPlan | None) -> None:
+    def __init__(self, plan: DayPlan | None = _DEFAULT_PLAN) -> None:
         self.plan = plan
         self.prefetch_calls: list[int] = []
 
@@ -63,44 +125,80 @@ class FakePrayerService:
         self.prefetch_calls.append(days)
 
 
-def _make_app(
-    *,
-    config_path: Path | None = None,
-    device_status_provider: Callable[[], dict] | None = None,
-    prayer_service: FakePrayerService | None = None,
-    command_runner: FakeRunner | None = None,
-) -> tuple[ControlPanelServer, TestScheduleService, FakeRouter, FakePlayer]:
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
-    test_scheduler = TestScheduleService(
-        scheduler=scheduler,
-        now_provider=FixedNow(datetime(2025, 1, 1, 10, 0)).now,
-        handler=lambda: None,
-        max_pending_tests=5,
-        max_minutes_ahead=1440,
+# One cheap pbkdf2 round is enough to exercise check_password_hash.
+_PASSWORD_HASH = generate_password_hash("secret", method="pbkdf2:sha256:1", salt_length=1)
+
+
+AppFactory = Callable[..., tuple[ControlPanelServer, TestScheduleService, FakeRouter, FakePlayer]]
+
+
+@pytest.fixture
+def app_factory() -> AppFactory:
+    def make(
+        *,
+        scheduler: object | None = None,
+        config_path: Path | None = None,
+        device_status_provider: Callable[[], dict] | None = None,
+        prayer_service: FakePrayerService | None = None,
+        command_runner: FakeRunner | None = None,
+        log_path: Path | None = None,
+    ) -> tuple[ControlPanelServer, TestScheduleService, FakeRouter, FakePlayer]:
+        if scheduler is None:
+            scheduler = FakeScheduler()
+        test_scheduler = TestScheduleService(
+            scheduler=scheduler,
+            now_provider=FixedNow(datetime(2025, 1, 1, 10, 0)).now,
+            handler=lambda: None,
+            max_pending_tests=5,
+            max_minutes_ahead=1440,
+        )
+        router = FakeRouter()
+        player = FakePlayer()
+        server = ControlPanelServer(
+            username="admin",
+            password_hash=_PASSWORD_HASH,
+            test_scheduler=test_scheduler,
+            secret_key="test-secret",
+            scheduler=scheduler,
+            audio_router=router,
+            play_handler=player,
+            log_path=str(log_path) if log_path else None,
+            quran_times=("06:30",),
+            config_path=str(config_path) if config_path else None,
+            device_status_provider=device_status_provider,
+            prayer_service=prayer_service,
+            command_runner=command_runner,
+        )
+        return server, test_scheduler, router, player
+
+    return make
+
+
+def _authed_client(server: ControlPanelServer) -> FlaskClient:
+    # Seed the signed session directly; the login form has its own tests.
+    client = server.app.test_client()
+    with client.session_transaction() as sess:
+        sess["user"] = "admin"
+    return client
+
+
+def test_importing_control_panel_does_not_import_flask() -> None:
+    code = (
+        "import sys, prayerhub.control_panel; "
+        "sys.exit(sorted({'flask', 'jinja2', 'werkzeug'} & sys.modules.keys()) or 0)"
     )
-    router = FakeRouter()
-    player = FakePlayer()
-    server = ControlPanelServer(
-        username="admin",
-        password_hash=generate_password_hash("secret"),
-        test_scheduler=test_scheduler,
-        secret_key="test-secret",
-        scheduler=scheduler,
-        audio_router=router,
-        play_handler=player,
-        log_path="logs/test.log",
-        quran_times=("06:30",),
-        config_path=str(config_path) if config_path else None,
-        device_status_provider=device_status_provider,
-        prayer_service=prayer_service,
-        command_runner=command_runner,
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        capture_output=True,
+        text=True,
     )
-    return server, test_scheduler, router, player
+
+    assert result.returncode == 0, result.stderr
 
 
-def test_login_required_redirects() -> None:
-    server, _, _, _ = _make_app()
+def test_login_required_redirects(app_factory: AppFactory) -> None:
+    server, _, _, _ = app_factory()
     client = server.app.test_client()
 
     resp = client.get("/")
@@ -113,8 +211,8 @@ def test_login_required_redirects() -> None:
     assert resp.status_code == 302
     assert "/login" in resp.headers["Location"]
 
-def test_valid_login_creates_session() -> None:
-    server, _, _, _ = _make_app()
+def test_valid_login_creates_session(app_factory: AppFactory) -> None:
+    server, _, _, _ = app_factory()
     client = server.app.test_client()
 
     resp = client.post(
@@ -127,15 +225,9 @@ def test_valid_login_creates_session() -> None:
     assert resp.headers["Location"].endswith("/")
 
 
-def test_schedule_test_creates_job() -> None:
-    server, test_scheduler, _, _ = _make_app()
-    client = server.app.test_client()
-
-    client.post(
-        "/login",
-        data={"username": "admin", "password": "secret"},
-        follow_redirects=True,
-    )
+def test_schedule_test_creates_job(app_factory: AppFactory) -> None:
+    server, test_scheduler, _, _ = app_factory()
+    client = _authed_client(server)
 
     resp = client.post(
         "/test/schedule",
@@ -147,26 +239,48 @@ def test_schedule_test_creates_job() -> None:
     assert test_scheduler.list_test_jobs()
 
 
-def test_dashboard_shows_next_jobs_and_test_jobs() -> None:
+def test_cancel_test_removes_job(app_factory: AppFactory) -> None:
+    server, test_scheduler, _, _ = app_factory()
+    client = _authed_client(server)
+    job_id = test_scheduler.schedule_test_in_minutes(5)
+
+    resp = client.post(f"/test/cancel/{job_id}")
+
+    assert resp.status_code == 302
+    assert test_scheduler.list_test_jobs() == []
+
+
+@pytest.mark.real_scheduler
+def test_schedule_and_cancel_test_on_real_scheduler(
+    paused_scheduler: BackgroundScheduler,
+    app_factory: AppFactory,
+) -> None:
+    server, test_scheduler, _, _ = app_factory(scheduler=paused_scheduler)
+    client = _authed_client(server)
+
+    client.post("/test/schedule", data={"time": "10:30"})
+
+    jobs = test_scheduler.list_test_jobs()
+    assert [job["id"] for job in jobs] == ["test_audio_202501011030"]
+    assert jobs[0]["run_date"].replace(tzinfo=None) == datetime(2025, 1, 1, 10, 30)
+
+    client.post("/test/cancel/test_audio_202501011030")
+
+    assert paused_scheduler.get_jobs() == []
+
+
+def test_dashboard_shows_next_jobs_and_test_jobs(
+    tmp_path: Path, app_factory: AppFactory
+) -> None:
     status_provider = lambda: {"bluetooth": "connected", "wifi": "ssid", "ip": "1.2.3.4"}
-    plan = DayPlan(
-        date=datetime(2025, 1, 1).date(),
-        madhab="shafi",
-        city="colombo",
-        times={"fajr": "05:05", "dhuhr": "12:10"},
-    )
-    prayer_service = FakePrayerService(plan)
-    server, test_scheduler, _, _ = _make_app(
+    prayer_service = FakePrayerService()
+    log_path = tmp_path / "test.log"
+    server, test_scheduler, _, _ = app_factory(
         device_status_provider=status_provider,
         prayer_service=prayer_service,
+        log_path=log_path,
     )
-    client = server.app.test_client()
-
-    client.post(
-        "/login",
-        data={"username": "admin", "password": "secret"},
-        follow_redirects=True,
-    )
+    client = _authed_client(server)
     test_scheduler.schedule_test_in_minutes(5)
     server.scheduler.add_job(
         lambda: None,
@@ -176,8 +290,6 @@ def test_dashboard_shows_next_jobs_and_test_jobs() -> None:
         replace_existing=True,
     )
 
-    log_path = Path("logs/test.log")
-    log_path.parent.mkdir(parents=True, exist_ok=True)
     log_path.write_text(
         "2025-01-01 10:00:00,000 INFO first\n"
         "2025-01-01 10:01:00,000 INFO second\n",
@@ -189,22 +301,27 @@ def test_dashboard_shows_next_jobs_and_test_jobs() -> None:
 
     assert "fajr" in body
     assert "test_audio" in body
-    assert body.find("second") < body.find("first")
+    # Newest log entries render first.
+    assert re.search(r"second.*first", body, re.DOTALL)
     assert "connected" in body
     assert "ssid" in body
     assert "1.2.3.4" in body
     assert "05:05" in body
 
 
-def test_controls_volume_buttons_call_router() -> None:
-    server, _, router, _ = _make_app()
-    client = server.app.test_client()
+def test_read_log_entries_reads_only_the_tail(tmp_path: Path) -> None:
+    log_path = tmp_path / "prayerhub.log"
+    log_path.write_text("".join(f"line{i:03d}\n" for i in range(100)), encoding="utf-8")
 
-    client.post(
-        "/login",
-        data={"username": "admin", "password": "secret"},
-        follow_redirects=True,
-    )
+    entries = _read_log_entries(str(log_path), hours=24, max_entries=800, max_bytes=20)
+
+    # 20 bytes lands inside line097, so only the two complete lines survive.
+    assert entries == ["line099", "line098"]
+
+
+def test_controls_volume_buttons_call_router(app_factory: AppFactory) -> None:
+    server, _, router, _ = app_factory()
+    client = _authed_client(server)
 
     client.post("/controls/volume", data={"direction": "up"})
     client.post("/controls/volume", data={"direction": "down"})
@@ -212,15 +329,9 @@ def test_controls_volume_buttons_call_router() -> None:
     assert router.calls == [55, 50]
 
 
-def test_controls_play_now_triggers_handler() -> None:
-    server, _, _, player = _make_app()
-    client = server.app.test_client()
-
-    client.post(
-        "/login",
-        data={"username": "admin", "password": "secret"},
-        follow_redirects=True,
-    )
+def test_controls_play_now_triggers_handler(app_factory: AppFactory) -> None:
+    server, _, _, player = app_factory()
+    client = _authed_client(server)
 
     resp = client.post("/controls/play-now", data={"event": "fajr"})
 
@@ -228,15 +339,9 @@ def test_controls_play_now_triggers_handler() -> None:
     assert player.events == ["fajr"]
 
 
-def test_controls_play_now_triggers_test_and_quran() -> None:
-    server, _, _, player = _make_app()
-    client = server.app.test_client()
-
-    client.post(
-        "/login",
-        data={"username": "admin", "password": "secret"},
-        follow_redirects=True,
-    )
+def test_controls_play_now_triggers_test_and_quran(app_factory: AppFactory) -> None:
+    server, _, _, player = app_factory()
+    client = _authed_client(server)
 
     resp = client.post("/controls/play-now", data={"event": "test_audio"})
     assert resp.status_code == 302
@@ -247,15 +352,9 @@ def test_controls_play_now_triggers_test_and_quran() -> None:
     assert player.events == ["test_audio", "quran@06:30"]
 
 
-def test_status_shows_next_jobs_and_test_jobs() -> None:
-    server, test_scheduler, _, _ = _make_app()
-    client = server.app.test_client()
-
-    client.post(
-        "/login",
-        data={"username": "admin", "password": "secret"},
-        follow_redirects=True,
-    )
+def test_status_shows_next_jobs_and_test_jobs(app_factory: AppFactory) -> None:
+    server, test_scheduler, _, _ = app_factory()
+    client = _authed_client(server)
     test_scheduler.schedule_test_in_minutes(5)
     server.scheduler.add_job(
         lambda: None,
@@ -271,8 +370,8 @@ def test_status_shows_next_jobs_and_test_jobs() -> None:
     assert "/?section=overview" in resp.headers["Location"]
 
 
-def _write_config(path: Path, audio_dir: Path) -> None:
-    content = f"""
+_CONFIG_TEMPLATE = string.Template(
+    """
 location:
   city: "colombo"
   madhab: "shafi"
@@ -285,10 +384,10 @@ api:
   prefetch_days: 7
 
 audio:
-  test_audio: "{audio_dir / 'test.mp3'}"
-  connected_tone: "{audio_dir / 'connected.mp3'}"
+  test_audio: "$audio_dir/test_beep.mp3"
+  connected_tone: "$audio_dir/connected.mp3"
   background_keepalive_enabled: false
-  background_keepalive_path: "{audio_dir / 'keepalive.mp3'}"
+  background_keepalive_path: "$audio_dir/keepalive_low_freq.mp3"
   background_keepalive_volume_percent: 1
   background_keepalive_loop: true
   background_keepalive_nice: 10
@@ -301,19 +400,19 @@ audio:
   playback_timeout_buffer_seconds: 5
   ffprobe_timeout_seconds: 5
   adhan:
-    fajr: "{audio_dir / 'adhan_fajr.mp3'}"
-    dhuhr: "{audio_dir / 'adhan_dhuhr.mp3'}"
-    asr: "{audio_dir / 'adhan_asr.mp3'}"
-    maghrib: "{audio_dir / 'adhan_maghrib.mp3'}"
-    isha: "{audio_dir / 'adhan_isha.mp3'}"
+    fajr: "$audio_dir/adhan_fajr.mp3"
+    dhuhr: "$audio_dir/adhan_dhuhr.mp3"
+    asr: "$audio_dir/adhan_asr.mp3"
+    maghrib: "$audio_dir/adhan_maghrib.mp3"
+    isha: "$audio_dir/adhan_isha.mp3"
   quran_schedule:
     - time: "06:30"
-      file: "{audio_dir / 'quran.mp3'}"
+      file: "$audio_dir/quran_morning.mp3"
   notifications:
-    sunrise: "{audio_dir / 'sunrise.mp3'}"
-    sunset: "{audio_dir / 'sunset.mp3'}"
-    midnight: "{audio_dir / 'midnight.mp3'}"
-    tahajjud: "{audio_dir / 'tahajjud.mp3'}"
+    sunrise: "$audio_dir/sunrise.mp3"
+    sunset: "$audio_dir/sunset.mp3"
+    midnight: "$audio_dir/midnight.mp3"
+    tahajjud: "$audio_dir/tahajjud.mp3"
   volumes:
     master_percent: 60
     adhan_percent: 85
@@ -340,39 +439,32 @@ control_panel:
 logging:
   file_path: "logs/prayerhub.log"
 """
-    path.write_text(content, encoding="utf-8")
-
-
-def test_config_page_loads_values(tmp_path: Path) -> None:
-    audio_dir = tmp_path / "audio"
-    audio_dir.mkdir()
-    for name in [
-        "test.mp3",
-        "connected.mp3",
-        "keepalive.mp3",
-        "adhan_fajr.mp3",
-        "adhan_dhuhr.mp3",
-        "adhan_asr.mp3",
-        "adhan_maghrib.mp3",
-        "adhan_isha.mp3",
-        "quran.mp3",
-        "sunrise.mp3",
-        "sunset.mp3",
-        "midnight.mp3",
-        "tahajjud.mp3",
-    ]:
-        (audio_dir / name).write_bytes(b"beep")
+)
 
-    config_path = tmp_path / "config.yml"
+
+def _write_config(path: Path, audio_dir: Path) -> None:
+    path.write_text(_CONFIG_TEMPLATE.substitute(audio_dir=audio_dir), encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def configured_audio(
+    tmp_path_factory: pytest.TempPathFactory, seed_audio: Callable[[Path], Path]
+) -> tuple[Path, Path]:
+    # Tests that save the config copy it first; the audio files are never written.
+    root = tmp_path_factory.mktemp("audio_cfg")
+    audio_dir = seed_audio(root / "audio")
+    config_path = root / "config.yml"
     _write_config(config_path, audio_dir)
+    return config_path, audio_dir
 
-    server, _, _, _ = _make_app(config_path=config_path)
-    client = server.app.test_client()
-    client.post(
-        "/login",
-        data={"username": "admin", "password": "secret"},
-        follow_redirects=True,
-    )
+
+def test_config_page_loads_values(
+    configured_audio: tuple[Path, Path], app_factory: AppFactory
+) -> None:
+    config_path, _ = configured_audio
+
+    server, _, _, _ = app_factory(config_path=config_path)
+    client = _authed_client(server)
 
     resp = client.get("/config")
     body = resp.get_data(as_text=True)
@@ -383,36 +475,15 @@ def test_config_page_loads_values(tmp_path: Path) -> None:
     assert "http://example.com" in body
 
 
-def test_config_save_updates_file(tmp_path: Path) -> None:
-    audio_dir = tmp_path / "audio"
-    audio_dir.mkdir()
-    for name in [
-        "test.mp3",
-        "connected.mp3",
-        "keepalive.mp3",
-        "adhan_fajr.mp3",
-        "adhan_dhuhr.mp3",
-        "adhan_asr.mp3",
-        "adhan_maghrib.mp3",
-        "adhan_isha.mp3",
-        "quran.mp3",
-        "sunrise.mp3",
-        "sunset.mp3",
-        "midnight.mp3",
-        "tahajjud.mp3",
-    ]:
-        (audio_dir / name).write_bytes(b"beep")
-
+def test_config_save_updates_file(
+    tmp_path: Path, configured_audio: tuple[Path, Path], app_factory: AppFactory
+) -> None:
+    shared_config, audio_dir = configured_audio
     config_path = tmp_path / "config.yml"
-    _write_config(config_path, audio_dir)
+    shutil.copyfile(shared_config, config_path)
 
-    server, _, _, _ = _make_app(config_path=config_path)
-    client = server.app.test_client()
-    client.post(
-        "/login",
-        data={"username": "admin", "password": "secret"},
-        follow_redirects=True,
-    )
+    server, _, _, _ = app_factory(config_path=config_path)
+    client = _authed_client(server)
 
     resp = client.post(
         "/config",
@@ -421,7 +492,7 @@ def test_config_save_updates_file(tmp_path: Path) -> None:
             "api_timeout": "12",
             "audio_timeout": "0",
             "quran_time_0": "07:00",
-            "quran_file_0": str(audio_dir / "quran.mp3"),
+            "quran_file_0": str(audio_dir / "quran_morning.mp3"),
             "action": "save",
         },
         follow_redirects=True,
@@ -433,37 +504,47 @@ def test_config_save_updates_file(tmp_path: Path) -> None:
     assert "playback_timeout_seconds: 0" in updated
 
 
-def test_config_save_restart_calls_runner(tmp_path: Path) -> None:
-    audio_dir = tmp_path / "audio"
-    audio_dir.mkdir()
-    for name in [
-        "test.mp3",
-        "connected.mp3",
-        "keepalive.mp3",
-        "adhan_fajr.mp3",
-        "adhan_dhuhr.mp3",
-        "adhan_asr.mp3",
-        "adhan_maghrib.mp3",
-        "adhan_isha.mp3",
-        "quran.mp3",
-        "sunrise.mp3",
-        "sunset.mp3",
-        "midnight.mp3",
-        "tahajjud.mp3",
-    ]:
-        (audio_dir / name).write_bytes(b"beep")
-
+def test_config_save_applies_secrets_overlay(
+    tmp_path: Path, configured_audio: tuple[Path, Path], app_factory: AppFactory
+) -> None:
+    shared_config, _ = configured_audio
     config_path = tmp_path / "config.yml"
-    _write_config(config_path, audio_dir)
+    base = shared_config.read_text(encoding="utf-8")
+    config_path.write_text(
+        base.replace('    password_hash: "pbkdf2:sha256:..."\n', ""), encoding="utf-8"
+    )
+    (tmp_path / "secrets.yml").write_text(
+        'control_panel:\n  auth:\n    password_hash: "pbkdf2:sha256:..."\n',
+        encoding="utf-8",
+    )
 
-    runner = FakeRunner()
-    server, _, _, _ = _make_app(config_path=config_path, command_runner=runner)
-    client = server.app.test_client()
-    client.post(
-        "/login",
-        data={"username": "admin", "password": "secret"},
+    server, _, _, _ = app_factory(config_path=config_path)
+    client = _authed_client(server)
+
+    resp = client.post(
+        "/config",
+        data={"location_city": "kandy", "action": "save"},
         follow_redirects=True,
     )
+    body = resp.get_data(as_text=True)
+
+    assert "Saved." in body
+    assert "password_hash is required" not in body
+    updated = config_path.read_text(encoding="utf-8")
+    assert "city: kandy" in updated
+    assert "password_hash" not in updated
+
+
+def test_config_save_restart_calls_runner(
+    tmp_path: Path, configured_audio: tuple[Path, Path], app_factory: AppFactory
+) -> None:
+    shared_config, _ = configured_audio
+    config_path = tmp_path / "config.yml"
+    shutil.copyfile(shared_config, config_path)
+
+    runner = FakeRunner()
+    server, _, _, _ = app_factory(config_path=config_path, command_runner=runner)
+    client = _authed_client(server)
 
     resp = client.post(
         "/config",
@@ -478,37 +559,14 @@ def test_config_save_restart_calls_runner(tmp_path: Path) -> None:
     assert runner.calls
 
 
-def test_config_reboot_calls_runner(tmp_path: Path) -> None:
-    audio_dir = tmp_path / "audio"
-    audio_dir.mkdir()
-    for name in [
-        "test.mp3",
-        "connected.mp3",
-        "keepalive.mp3",
-        "adhan_fajr.mp3",
-        "adhan_dhuhr.mp3",
-        "adhan_asr.mp3",
-        "adhan_maghrib.mp3",
-        "adhan_isha.mp3",
-        "quran.mp3",
-        "sunrise.mp3",
-        "sunset.mp3",
-        "midnight.mp3",
-        "tahajjud.mp3",
-    ]:
-        (audio_dir / name).write_bytes(b"beep")
-
-    config_path = tmp_path / "config.yml"
-    _write_config(config_path, audio_dir)
+def test_config_reboot_calls_runner(
+    configured_audio: tuple[Path, Path], app_factory: AppFactory
+) -> None:
+    config_path, _ = configured_audio
 
     runner = FakeRunner()
-    server, _, _, _ = _make_app(config_path=config_path, command_runner=runner)
-    client = server.app.test_client()
-    client.post(
-        "/login",
-        data={"username": "admin", "password": "secret"},
-        follow_redirects=True,
-    )
+    server, _, _, _ = app_factory(config_path=config_path, command_runner=runner)
+    client = _authed_client(server)
 
     resp = client.post(
         "/config",
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
 from prayerhub.logging_utils import LoggerFactory
@@ -11,9 +12,16 @@ def test_logger_factory_writes_to_rotating_file(tmp_path: Path) -> None:
     logger = LoggerFactory.create("test_logger", log_file=log_path)
     logger.info("hello log")
 
-    for handler in logging.getLogger().handlers:
-        handler.flush()
-        handler.close()
+    root_logger = logging.getLogger()
+    file_handlers = [
+        handler
+        for handler in root_logger.handlers
+        if isinstance(handler, RotatingFileHandler)
+        and Path(handler.baseFilename) == log_path
+    ]
+    assert len(file_handlers) == 1
+    # Detach only our handler so pytest's own capture handlers stay intact.
+    root_logger.removeHandler(file_handlers[0])
+    file_handlers[0].close()
 
-    assert log_path.exists()
     assert "hello log" in log_path.read_text(encoding="utf-8")
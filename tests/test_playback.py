@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from pathlib import Path
+from typing import Callable
 
 import pytest
 
@@ -40,12 +42,24 @@ class FakeTimeoutPolicy:
         return self.timeout_seconds
 
 
-def _audio_config() -> AudioConfig:
+@pytest.fixture(scope="session")
+def audio_root(
+    tmp_path_factory: pytest.TempPathFactory, seed_audio: Callable[[Path], Path]
+) -> Path:
+    root = tmp_path_factory.mktemp("playback")
+    seed_audio(root / "data" / "audio")
+    return root
+
+
+@pytest.fixture(scope="session")
+def audio_config(audio_root: Path) -> AudioConfig:
+    # AudioConfig is frozen, so one instance is safely shared by every test.
+    audio_dir = audio_root / "data" / "audio"
     return AudioConfig(
-        test_audio="data/audio/test_beep.mp3",
-        connected_tone="data/audio/connected.mp3",
+        test_audio=str(audio_dir / "test_beep.mp3"),
+        connected_tone=str(audio_dir / "connected.mp3"),
         background_keepalive_enabled=False,
-        background_keepalive_path="data/audio/keepalive_low_freq.mp3",
+        background_keepalive_path=str(audio_dir / "keepalive_low_freq.mp3"),
         background_keepalive_volume_percent=1,
         background_keepalive_loop=True,
         background_keepalive_nice=10,
@@ -54,18 +68,20 @@ def _audio_config() -> AudioConfig:
         background_keepalive_volume_cycle_max_percent=10,
         background_keepalive_volume_cycle_step_seconds=1.0,
         adhan=AdhanAudio(
-            fajr="data/audio/adhan_fajr.mp3",
-            dhuhr="data/audio/adhan_dhuhr.mp3",
-            asr="data/audio/adhan_asr.mp3",
-            maghrib="data/audio/adhan_maghrib.mp3",
-            isha="data/audio/adhan_isha.mp3",
+            fajr=str(audio_dir / "adhan_fajr.mp3"),
+            dhuhr=str(audio_dir / "adhan_dhuhr.mp3"),
+            asr=str(audio_dir / "adhan_asr.mp3"),
+            maghrib=str(audio_dir / "adhan_maghrib.mp3"),
+            isha=str(audio_dir / "adhan_isha.mp3"),
+        ),
+        quran_schedule=(
+            QuranScheduleItem(time="06:30", file=str(audio_dir / "quran_morning.mp3")),
         ),
-        quran_schedule=(QuranScheduleItem(time="06:30", file="data/audio/quran_morning.mp3"),),
         notifications=NotificationAudio(
-            sunrise="data/audio/sunrise.mp3",
-            sunset="data/audio/sunset.mp3",
-            midnight="data/audio/midnight.mp3",
-            tahajjud="data/audio/tahajjud.mp3",
+            sunrise=str(audio_dir / "sunrise.mp3"),
+            sunset=str(audio_dir / "sunset.mp3"),
+            midnight=str(audio_dir / "midnight.mp3"),
+            tahajjud=str(audio_dir / "tahajjud.mp3"),
         ),
         volumes=AudioVolumes(
             master_percent=60,
@@ -82,121 +98,89 @@ def _audio_config() -> AudioConfig:
     )
 
 
-def test_handler_skips_when_bluetooth_unavailable(tmp_path: Path, monkeypatch) -> None:
-    monkeypatch.chdir(tmp_path)
-    bluetooth = FakeBluetooth(connected=False)
-    player = FakePlayer()
-
-    handler = PlaybackHandler(
-        bluetooth=bluetooth,
-        player=player,
-        audio=_audio_config(),
-    )
-
-    assert handler.handle_event("fajr") is False
-    assert bluetooth.calls == 1
-    assert player.calls == []
-
+@pytest.fixture
+def player() -> FakePlayer:
+    return FakePlayer()
 
-def test_handler_plays_fajr_with_fajr_volume(tmp_path: Path, monkeypatch) -> None:
-    audio_dir = tmp_path / "data" / "audio"
-    audio_dir.mkdir(parents=True)
-    (audio_dir / "adhan_fajr.mp3").write_bytes(b"beep")
-    monkeypatch.chdir(tmp_path)
 
-    bluetooth = FakeBluetooth(connected=True)
-    player = FakePlayer()
-    handler = PlaybackHandler(
-        bluetooth=bluetooth,
+@pytest.fixture
+def handler(audio_config: AudioConfig, player: FakePlayer) -> PlaybackHandler:
+    return PlaybackHandler(
+        bluetooth=FakeBluetooth(connected=True),
         player=player,
-        audio=_audio_config(),
+        audio=audio_config,
     )
 
-    assert handler.handle_event("fajr") is True
-    assert player.calls == [(audio_dir / "adhan_fajr.mp3", 60, 300)]
 
-
-def test_handler_plays_notification_with_notification_volume(tmp_path: Path, monkeypatch) -> None:
-    audio_dir = tmp_path / "data" / "audio"
-    audio_dir.mkdir(parents=True)
-    (audio_dir / "sunrise.mp3").write_bytes(b"beep")
-    monkeypatch.chdir(tmp_path)
-
-    bluetooth = FakeBluetooth(connected=True)
+def test_handler_skips_when_bluetooth_unavailable(audio_config: AudioConfig) -> None:
+    bluetooth = FakeBluetooth(connected=False)
     player = FakePlayer()
-    handler = PlaybackHandler(
-        bluetooth=bluetooth,
-        player=player,
-        audio=_audio_config(),
-    )
-
-    assert handler.handle_event("sunrise") is True
-    assert player.calls == [(audio_dir / "sunrise.mp3", 50, 300)]
-
 
-def test_handler_plays_quran_when_matching_time(tmp_path: Path, monkeypatch) -> None:
-    audio_dir = tmp_path / "data" / "audio"
-    audio_dir.mkdir(parents=True)
-    (audio_dir / "quran_morning.mp3").write_bytes(b"beep")
-    monkeypatch.chdir(tmp_path)
-
-    bluetooth = FakeBluetooth(connected=True)
-    player = FakePlayer()
     handler = PlaybackHandler(
         bluetooth=bluetooth,
         player=player,
-        audio=_audio_config(),
+        audio=audio_config,
     )
 
-    assert handler.handle_event("quran@06:30") is True
-    assert player.calls == [(audio_dir / "quran_morning.mp3", 55, 300)]
-
+    assert handler.handle_event("fajr") is False
+    assert bluetooth.calls == 1
+    assert player.calls == []
 
-def test_handler_plays_test_audio_with_test_volume(tmp_path: Path, monkeypatch) -> None:
-    audio_dir = tmp_path / "data" / "audio"
-    audio_dir.mkdir(parents=True)
-    (audio_dir / "test_beep.mp3").write_bytes(b"beep")
-    monkeypatch.chdir(tmp_path)
 
-    bluetooth = FakeBluetooth(connected=True)
-    player = FakePlayer()
+@pytest.mark.parametrize(
+    ("event", "filename", "expected_volume"),
+    [
+        ("fajr", "adhan_fajr.mp3", 60),
+        ("sunrise", "sunrise.mp3", 50),
+        ("quran@06:30", "quran_morning.mp3", 55),
+        ("test_audio", "test_beep.mp3", 70),
+    ],
+    ids=["fajr", "notification", "quran", "test_audio"],
+)
+def test_handler_plays_event_with_event_volume(
+    event: str,
+    filename: str,
+    expected_volume: int,
+    audio_root: Path,
+    player: FakePlayer,
+    handler: PlaybackHandler,
+) -> None:
+    assert handler.handle_event(event) is True
+    assert player.calls == [(audio_root / "data" / "audio" / filename, expected_volume, 300)]
+
+
+def test_handler_resolves_relative_paths_from_cwd(
+    audio_root: Path, audio_config: AudioConfig, player: FakePlayer, monkeypatch
+) -> None:
+    monkeypatch.chdir(audio_root)
     handler = PlaybackHandler(
-        bluetooth=bluetooth,
+        bluetooth=FakeBluetooth(connected=True),
         player=player,
-        audio=_audio_config(),
+        audio=replace(audio_config, test_audio="data/audio/test_beep.mp3"),
     )
 
     assert handler.handle_event("test_audio") is True
-    assert player.calls == [(audio_dir / "test_beep.mp3", 70, 300)]
-
+    assert player.calls == [(audio_root / "data" / "audio" / "test_beep.mp3", 70, 300)]
 
-def test_handler_catches_player_errors(tmp_path: Path, monkeypatch) -> None:
-    audio_dir = tmp_path / "data" / "audio"
-    audio_dir.mkdir(parents=True)
-    (audio_dir / "adhan_fajr.mp3").write_bytes(b"beep")
-    monkeypatch.chdir(tmp_path)
 
+def test_handler_catches_player_errors(audio_config: AudioConfig) -> None:
     bluetooth = FakeBluetooth(connected=True)
     player = FakePlayer(should_raise=True)
     handler = PlaybackHandler(
         bluetooth=bluetooth,
         player=player,
-        audio=_audio_config(),
+        audio=audio_config,
     )
 
     assert handler.handle_event("fajr") is False
 
 
-def test_handler_disables_timeout_when_configured(tmp_path: Path, monkeypatch) -> None:
-    audio_dir = tmp_path / "data" / "audio"
-    audio_dir.mkdir(parents=True)
-    (audio_dir / "adhan_fajr.mp3").write_bytes(b"beep")
-    monkeypatch.chdir(tmp_path)
-
+def test_handler_disables_timeout_when_configured(
+    audio_root: Path, audio_config: AudioConfig
+) -> None:
     bluetooth = FakeBluetooth(connected=True)
     player = FakePlayer()
-    audio = _audio_config()
-    audio = audio.__class__(**{**audio.__dict__, "playback_timeout_seconds": 0})
+    audio = replace(audio_config, playback_timeout_seconds=0)
     handler = PlaybackHandler(
         bluetooth=bluetooth,
         player=player,
@@ -204,20 +188,16 @@ def test_handler_disables_timeout_when_configured(tmp_path: Path, monkeypatch) -
     )
 
     assert handler.handle_event("fajr") is True
-    assert player.calls == [(audio_dir / "adhan_fajr.mp3", 60, None)]
+    assert player.calls == [(audio_root / "data" / "audio" / "adhan_fajr.mp3", 60, None)]
 
 
-def test_handler_uses_timeout_policy_when_provided(tmp_path: Path, monkeypatch) -> None:
-    audio_dir = tmp_path / "data" / "audio"
-    audio_dir.mkdir(parents=True)
-    (audio_dir / "adhan_fajr.mp3").write_bytes(b"beep")
-    monkeypatch.chdir(tmp_path)
-
+def test_handler_uses_timeout_policy_when_provided(
+    audio_root: Path, audio_config: AudioConfig
+) -> None:
     bluetooth = FakeBluetooth(connected=True)
     player = FakePlayer()
     policy = FakeTimeoutPolicy(42)
-    audio = _audio_config()
-    audio = audio.__class__(**{**audio.__dict__, "playback_timeout_strategy": "auto"})
+    audio = replace(audio_config, playback_timeout_strategy="auto")
     handler = PlaybackHandler(
         bluetooth=bluetooth,
         player=player,
@@ -225,25 +205,13 @@ def test_handler_uses_timeout_policy_when_provided(tmp_path: Path, monkeypatch)
         timeout_policy=policy,
     )
 
+    fajr_path = audio_root / "data" / "audio" / "adhan_fajr.mp3"
     assert handler.handle_event("fajr") is True
-    assert policy.calls == [audio_dir / "adhan_fajr.mp3"]
-    assert player.calls == [(audio_dir / "adhan_fajr.mp3", 60, 42)]
-
-
-def test_handler_logs_playback_details(tmp_path: Path, monkeypatch, caplog) -> None:
-    audio_dir = tmp_path / "data" / "audio"
-    audio_dir.mkdir(parents=True)
-    (audio_dir / "adhan_fajr.mp3").write_bytes(b"beep")
-    monkeypatch.chdir(tmp_path)
+    assert policy.calls == [fajr_path]
+    assert player.calls == [(fajr_path, 60, 42)]
 
-    bluetooth = FakeBluetooth(connected=True)
-    player = FakePlayer()
-    handler = PlaybackHandler(
-        bluetooth=bluetooth,
-        player=player,
-        audio=_audio_config(),
-    )
 
+def test_handler_logs_playback_details(handler: PlaybackHandler, caplog) -> None:
     with caplog.at_level("INFO"):
         assert handler.handle_event("fajr") is True
 
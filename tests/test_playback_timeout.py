@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 import subprocess
+import threading
+from types import SimpleNamespace
+import wave
 
 import pytest
 
 from prayerhub.playback_timeout import PlaybackTimeoutPolicy
-from prayerhub.playback_timeout import FfprobeDurationProbe
+from prayerhub.playback_timeout import FfprobeDurationProbe, HeaderDurationProbe
 
 
 class FakeProbe:
@@ -30,9 +34,11 @@ class TimeoutRunner:
 class CountingRunner:
     def __init__(self, stdout: str = "12.5\n") -> None:
         self.calls = 0
+        self.which_calls = 0
         self.stdout = stdout
 
     def which(self, _name: str) -> str | None:
+        self.which_calls += 1
         return "/usr/bin/ffprobe"
 
     def run(self, args, *, timeout):
@@ -40,6 +46,45 @@ class CountingRunner:
         return subprocess.CompletedProcess(args, 0, self.stdout, "")
 
 
+class StatStub:
+    def __init__(self) -> None:
+        self.st_mtime_ns = 1
+        self.st_size = 4
+
+    def __call__(self, _path: Path) -> SimpleNamespace:
+        return SimpleNamespace(st_mtime_ns=self.st_mtime_ns, st_size=self.st_size)
+
+
+def _write_wav(path: Path, *, seconds: float, frame_rate: int = 1000) -> Path:
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(1)
+        handle.setframerate(frame_rate)
+        handle.writeframes(b"\x80" * int(seconds * frame_rate))
+    return path
+
+
+_ADHAN = Path("adhan.mp3")
+
+
+@pytest.fixture
+def audio_path(tmp_path: Path) -> Path:
+    path = tmp_path / "audio.mp3"
+    path.write_bytes(b"beep")
+    return path
+
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo: 417-byte frames of 1152 samples.
+_MP3_FRAME_HEADER = b"\xff\xfb\x90\x00"
+_MP3_FRAME_LENGTH = 417
+
+
+def _mp3_frames(count: int, first_frame: bytes = b"") -> bytes:
+    first = (_MP3_FRAME_HEADER + first_frame).ljust(_MP3_FRAME_LENGTH, b"\x00")
+    rest = _MP3_FRAME_HEADER.ljust(_MP3_FRAME_LENGTH, b"\x00")
+    return first + rest * (count - 1)
+
+
 def test_auto_timeout_uses_duration_with_buffer() -> None:
     probe = FakeProbe(12.2)
     policy = PlaybackTimeoutPolicy(
@@ -49,52 +94,114 @@ def test_auto_timeout_uses_duration_with_buffer() -> None:
         duration_probe=probe,
     )
 
-    timeout = policy.resolve(Path("adhan.mp3"))
+    timeout = policy.resolve(_ADHAN)
 
     assert timeout == 18
-    assert probe.calls == [Path("adhan.mp3")]
+    assert probe.calls == [_ADHAN]
 
 
-def test_auto_timeout_falls_back_when_duration_missing() -> None:
-    probe = FakeProbe(None)
+def test_auto_timeout_uses_wav_header_duration(tmp_path: Path) -> None:
+    path = _write_wav(tmp_path / "adhan.wav", seconds=12.2)
+    fallback = FakeProbe(99.0)
     policy = PlaybackTimeoutPolicy(
         strategy="auto",
-        fallback_seconds=120,
+        fallback_seconds=300,
         buffer_seconds=5,
-        duration_probe=probe,
+        duration_probe=HeaderDurationProbe(fallback=fallback),
     )
 
-    timeout = policy.resolve(Path("adhan.mp3"))
+    timeout = policy.resolve(path)
 
-    assert timeout == 120
+    assert timeout == 18
+    assert fallback.calls == []
 
 
-def test_auto_timeout_can_disable_when_fallback_is_zero() -> None:
-    probe = FakeProbe(None)
-    policy = PlaybackTimeoutPolicy(
-        strategy="auto",
-        fallback_seconds=0,
-        buffer_seconds=5,
-        duration_probe=probe,
-    )
+def test_header_probe_reads_wav_duration(tmp_path: Path) -> None:
+    path = _write_wav(tmp_path / "tone.wav", seconds=2.5, frame_rate=8000)
 
-    timeout = policy.resolve(Path("adhan.mp3"))
+    assert HeaderDurationProbe().duration_seconds(path) == pytest.approx(2.5)
 
-    assert timeout is None
 
+def test_header_probe_estimates_cbr_mp3_after_id3_tag(tmp_path: Path) -> None:
+    # ID3v2 header with a 100-byte syncsafe size, followed by the tag body.
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x64" + b"\x00" * 100
+    path = tmp_path / "cbr.mp3"
+    path.write_bytes(id3 + _mp3_frames(100) + b"TAG" + b"\x00" * 125)
 
-def test_fixed_timeout_uses_fallback() -> None:
-    probe = FakeProbe(12.2)
+    duration = HeaderDurationProbe().duration_seconds(path)
+
+    assert duration == pytest.approx(100 * _MP3_FRAME_LENGTH * 8 / 128_000)
+
+
+def test_header_probe_uses_xing_frame_count(tmp_path: Path) -> None:
+    # Stereo MPEG-1 side info is 32 bytes; flag 0x1 means a frame count follows.
+    xing = b"\x00" * 32 + b"Xing" + (1).to_bytes(4, "big") + (200).to_bytes(4, "big")
+    path = tmp_path / "vbr.mp3"
+    path.write_bytes(_mp3_frames(3, first_frame=xing))
+
+    duration = HeaderDurationProbe().duration_seconds(path)
+
+    assert duration == pytest.approx(200 * 1152 / 44_100)
+
+
+def test_header_probe_ignores_stray_sync_word_in_other_formats(tmp_path: Path) -> None:
+    # A sync word near the end of the read window used to be accepted unverified.
+    body = bytearray(b"OggS" + b"\x00" * (64 * 1024 + 4096))
+    body[64 * 1024 - 8 : 64 * 1024 - 4] = _MP3_FRAME_HEADER
+    path = tmp_path / "audio.ogg"
+    path.write_bytes(bytes(body))
+    fallback = FakeProbe(180.0)
+
+    duration = HeaderDurationProbe(fallback=fallback).duration_seconds(path)
+
+    assert duration == 180.0
+    assert fallback.calls == [path]
+
+
+def test_header_probe_requires_second_frame(tmp_path: Path) -> None:
+    path = tmp_path / "single.mp3"
+    path.write_bytes(_mp3_frames(1))
+    fallback = FakeProbe(7.0)
+
+    assert HeaderDurationProbe(fallback=fallback).duration_seconds(path) == 7.0
+
+
+def test_header_probe_falls_back_for_unknown_format(tmp_path: Path) -> None:
+    path = tmp_path / "audio.ogg"
+    path.write_bytes(b"OggS" + b"\x00" * 64)
+    fallback = FakeProbe(7.0)
+
+    duration = HeaderDurationProbe(fallback=fallback).duration_seconds(path)
+
+    assert duration == 7.0
+    assert fallback.calls == [path]
+
+
+@pytest.mark.parametrize(
+    ("strategy", "duration", "fallback_seconds", "expected"),
+    [
+        pytest.param("auto", None, 120, 120, id="auto-falls-back-when-duration-missing"),
+        pytest.param("auto", None, 0, None, id="auto-disabled-when-fallback-zero"),
+        pytest.param("fixed", 12.2, 90, 90, id="fixed-uses-fallback"),
+    ],
+)
+def test_timeout_uses_fallback(
+    strategy: str,
+    duration: float | None,
+    fallback_seconds: int,
+    expected: int | None,
+) -> None:
+    probe = FakeProbe(duration)
     policy = PlaybackTimeoutPolicy(
-        strategy="fixed",
-        fallback_seconds=90,
+        strategy=strategy,
+        fallback_seconds=fallback_seconds,
         buffer_seconds=5,
         duration_probe=probe,
     )
 
-    timeout = policy.resolve(Path("adhan.mp3"))
-
-    assert timeout == 90
+    assert policy.resolve(_ADHAN) == expected
+    # The fixed strategy must not pay for a probe it ignores.
+    assert probe.calls == ([] if strategy == "fixed" else [_ADHAN])
 
 
 def test_ffprobe_timeout_returns_none(tmp_path: Path) -> None:
@@ -105,29 +212,85 @@ def test_ffprobe_timeout_returns_none(tmp_path: Path) -> None:
     assert duration is None
 
 
-def test_ffprobe_duration_cached_until_file_changes(tmp_path: Path) -> None:
-    audio_path = tmp_path / "audio.mp3"
-    audio_path.write_bytes(b"beep")
+def test_ffprobe_duration_cached_until_file_changes() -> None:
+    stat = StatStub()
     runner = CountingRunner(stdout="10.0\n")
-    probe = FfprobeDurationProbe(runner=runner)
+    probe = FfprobeDurationProbe(runner=runner, stat_fn=stat)
 
-    first = probe.duration_seconds(audio_path)
-    second = probe.duration_seconds(audio_path)
+    first = probe.duration_seconds(_ADHAN)
+    second = probe.duration_seconds(_ADHAN)
 
     assert first == 10.0
     assert second == 10.0
     assert runner.calls == 1
+    assert runner.which_calls == 1
 
-    audio_path.write_bytes(b"beep-beep")
-    third = probe.duration_seconds(audio_path)
+    stat.st_mtime_ns += 1
+    third = probe.duration_seconds(_ADHAN)
 
     assert third == 10.0
     assert runner.calls == 2
+    assert runner.which_calls == 1
+
+
+def test_ffprobe_concurrent_lookups_share_one_run(audio_path: Path) -> None:
+    started = threading.Event()
+    release = threading.Event()
+    second_miss = threading.Event()
+    misses: list[str] = []
+
+    class BlockingRunner(CountingRunner):
+        def run(self, args, *, timeout):
+            started.set()
+            release.wait(timeout=5)
+            return super().run(args, timeout=timeout)
+
+    class MissWatcher(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            if record.getMessage().startswith("ffprobe cache miss"):
+                misses.append(record.getMessage())
+                if len(misses) == 2:
+                    second_miss.set()
+
+    runner = BlockingRunner()
+    probe = FfprobeDurationProbe(runner=runner)
+    watcher = MissWatcher()
+    logger = logging.getLogger("FfprobeDurationProbe")
+    logger.addHandler(watcher)
+    previous_level = logger.level
+    logger.setLevel(logging.INFO)
+    results: list[float | None] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(probe.duration_seconds(audio_path)))
+        for _ in range(2)
+    ]
+    try:
+        threads[0].start()
+        assert started.wait(timeout=5)
+        threads[1].start()
+        # Only release the first run once the second lookup has also missed the
+        # cache, so it must wait on the per-path lock rather than hit the cache.
+        assert second_miss.wait(timeout=5)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+    finally:
+        release.set()
+        logger.removeHandler(watcher)
+        logger.setLevel(previous_level)
+
+    assert results == [12.5, 12.5]
+    assert runner.calls == 1
+
+
+@pytest.mark.parametrize("stdout", ["N/A\n", "\n", "nan\n", "garbage\n"])
+def test_ffprobe_rejects_unusable_duration(audio_path: Path, stdout: str) -> None:
+    probe = FfprobeDurationProbe(runner=CountingRunner(stdout=stdout))
+
+    assert probe.duration_seconds(audio_path) is None
 
 
-def test_ffprobe_logs_cache_activity(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
-    audio_path = tmp_path / "audio.mp3"
-    audio_path.write_bytes(b"beep")
+def test_ffprobe_logs_cache_activity(audio_path: Path, caplog: pytest.LogCaptureFixture) -> None:
     runner = CountingRunner(stdout="10.0\n")
     probe = FfprobeDurationProbe(runner=runner)
 
@@ -139,9 +302,7 @@ def test_ffprobe_logs_cache_activity(tmp_path: Path, caplog: pytest.LogCaptureFi
     assert "ffprobe cache hit" in caplog.text
 
 
-def test_timeout_policy_logs_resolution(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
-    audio_path = tmp_path / "audio.mp3"
-    audio_path.write_bytes(b"beep")
+def test_timeout_policy_logs_resolution(audio_path: Path, caplog: pytest.LogCaptureFixture) -> None:
     probe = FakeProbe(12.2)
     policy = PlaybackTimeoutPolicy(
         strategy="auto",
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable
 
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
 
 from prayerhub.prayer_api import PrayerApiClient
 from prayerhub.prayer_times import ApiError
 
 
-@dataclass
+@dataclass(frozen=True)
 class FakeResponse:
     status_code: int
     payload: object
@@ -23,89 +27,97 @@ class FakeResponse:
 
 class FakeSession:
     def __init__(self, results: list[object]) -> None:
-        self._results = list(results)
-        self.calls: list[tuple[str, dict[str, str], int]] = []
+        self._results = deque(results)
+        self.calls: deque[tuple[str, dict[str, str], int | None]] = deque()
 
     def get(self, url: str, *, params: dict[str, str], timeout: int | None):
         self.calls.append((url, params, timeout))
         if not self._results:
             raise AssertionError("No fake result configured")
-        result = self._results.pop(0)
+        result = self._results.popleft()
         if isinstance(result, Exception):
             raise result
         return result
 
 
-def test_retries_on_request_exception() -> None:
+# Responses are immutable, so tests share them instead of rebuilding each one.
+_DAY = date(2025, 1, 1)
+_OK = FakeResponse(200, {"ok": True})
+_SERVER_ERROR = FakeResponse(500, {"error": "bad"}, text="bad")
+_CLIENT_ERROR = FakeResponse(400, {"error": "bad"}, text="bad")
+
+ClientFactory = Callable[..., PrayerApiClient]
+
+
+@pytest.fixture
+def sleeps() -> list[float]:
+    return []
+
+
+@pytest.fixture
+def make_client(sleeps: list[float]) -> ClientFactory:
+    def make(session: FakeSession, **overrides: Any) -> PrayerApiClient:
+        options: dict[str, Any] = {
+            "base_url": "http://example.com",
+            "timeout_seconds": 1,
+            "sleep": sleeps.append,
+            "session": session,
+        }
+        options.update(overrides)
+        return PrayerApiClient(**options)
+
+    return make
+
+
+def test_retries_on_request_exception(
+    make_client: ClientFactory, sleeps: list[float]
+) -> None:
     session = FakeSession(
         [
             requests.RequestException("network"),
             requests.RequestException("network"),
-            FakeResponse(200, {"ok": True}),
+            _OK,
         ]
     )
-    sleeps: list[float] = []
-
-    client = PrayerApiClient(
-        base_url="http://example.com",
-        timeout_seconds=1,
-        max_retries=2,
-        backoff_base_seconds=1.0,
-        sleep=sleeps.append,
-        session=session,
-    )
+    client = make_client(session, max_retries=2, backoff_base_seconds=1.0)
 
-    payload = client.get_date(madhab="shafi", city="colombo", day=_fake_day())
+    payload = client.get_date(madhab="shafi", city="colombo", day=_DAY)
 
     assert payload == {"ok": True}
     assert len(session.calls) == 3
     assert sleeps == [1.0, 2.0]
 
 
-def test_retries_on_server_error() -> None:
-    session = FakeSession(
-        [
-            FakeResponse(500, {"error": "bad"}, text="bad"),
-            FakeResponse(200, {"ok": True}),
-        ]
-    )
-    sleeps: list[float] = []
-
-    client = PrayerApiClient(
-        base_url="http://example.com",
-        timeout_seconds=1,
-        max_retries=1,
-        backoff_base_seconds=0.5,
-        sleep=sleeps.append,
-        session=session,
-    )
+def test_retries_on_server_error(
+    make_client: ClientFactory, sleeps: list[float]
+) -> None:
+    session = FakeSession([_SERVER_ERROR, _OK])
+    client = make_client(session, max_retries=1, backoff_base_seconds=0.5)
 
-    payload = client.get_date(madhab="shafi", city="colombo", day=_fake_day())
+    payload = client.get_date(madhab="shafi", city="colombo", day=_DAY)
 
     assert payload == {"ok": True}
     assert sleeps == [0.5]
 
 
-def test_no_retry_on_client_error() -> None:
-    session = FakeSession([FakeResponse(400, {"error": "bad"}, text="bad")])
-    sleeps: list[float] = []
-
-    client = PrayerApiClient(
-        base_url="http://example.com",
-        timeout_seconds=1,
-        max_retries=3,
-        sleep=sleeps.append,
-        session=session,
-    )
+def test_no_retry_on_client_error(
+    make_client: ClientFactory, sleeps: list[float]
+) -> None:
+    session = FakeSession([_CLIENT_ERROR])
+    client = make_client(session, max_retries=3)
 
     with pytest.raises(ApiError):
-        client.get_date(madhab="shafi", city="colombo", day=_fake_day())
+        client.get_date(madhab="shafi", city="colombo", day=_DAY)
 
     assert len(session.calls) == 1
     assert sleeps == []
 
 
-def _fake_day():
-    from datetime import date
+def test_default_session_pools_connections() -> None:
+    client = PrayerApiClient(base_url="https://example.com")
+
+    adapter = client._session.get_adapter("https://example.com/api/v1/times/date/")
 
-    return date(2025, 1, 1)
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize == 16
+    assert adapter.max_retries.total == 0
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import deque
 from datetime import date, datetime
 
 import pytest
@@ -9,6 +10,7 @@ from prayerhub.prayer_times import (
     ApiError,
     DayPlan,
     PrayerTimeService,
+    _combine,
     day_plan_from_api,
     day_plans_from_range,
 )
@@ -29,7 +31,7 @@ class FakeApiClient:
         self._fail_range = fail_range
         self._fail_date = fail_date
         self.range_calls = 0
-        self.date_calls = []
+        self.date_calls: deque[date] = deque()
 
     def get_range(self, *, madhab: str, city: str, start: date, end: date):
         self.range_calls += 1
@@ -110,7 +112,7 @@ def test_range_failure_falls_back_to_per_date(tmp_path) -> None:
     service.prefetch(days=2)
 
     assert api.range_calls == 1
-    assert api.date_calls == [base_date, base_date.replace(day=2)]
+    assert sorted(api.date_calls) == [base_date, base_date.replace(day=2)]
     assert service.get_day(base_date) is not None
     assert service.get_day(base_date.replace(day=2)) is not None
 
@@ -200,3 +202,14 @@ def test_missing_sunset_is_derived_from_maghrib(tmp_path) -> None:
     plan = service.get_day(date(2025, 1, 1))
     assert plan is not None
     assert plan.times["sunset"] == "17:40"
+
+
+@pytest.mark.parametrize("value", ["05:07", "5:07"])
+def test_combine_parses_hhmm_on_plan_date(value: str) -> None:
+    assert _combine(date(2025, 1, 1), value) == datetime(2025, 1, 1, 5, 7)
+
+
+@pytest.mark.parametrize("value", ["05-07", "05:0x", "24:00", "05:07:00", "005:07"])
+def test_combine_rejects_malformed_times(value: str) -> None:
+    with pytest.raises(ValueError):
+        _combine(date(2025, 1, 1), value)
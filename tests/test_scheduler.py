@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from datetime import date, datetime, time
+from functools import lru_cache
 
+import pytest
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from prayerhub.prayer_times import DayPlan
-from prayerhub.scheduler import JobScheduler
+from prayerhub.scheduler import JobScheduler, date_suffix
 
 
 class FixedNow:
@@ -16,22 +18,20 @@ class FixedNow:
         return self._now
 
 
-def test_reschedule_logs_removed_jobs(tmp_path, caplog) -> None:
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
+def test_reschedule_logs_removed_jobs(paused_scheduler: BackgroundScheduler, caplog) -> None:
     job_scheduler = JobScheduler(
-        scheduler=scheduler,
+        scheduler=paused_scheduler,
         handler=lambda *_: None,
         now_provider=FixedNow(datetime(2025, 1, 1, 4, 0)).now,
     )
 
-    scheduler.add_job(
+    paused_scheduler.add_job(
         lambda: None,
         trigger="date",
         id="event_fajr_20250101",
         run_date=datetime(2025, 1, 1, 5, 0),
     )
-    scheduler.add_job(
+    paused_scheduler.add_job(
         lambda: None,
         trigger="date",
         id="event_other_20250102",
@@ -42,26 +42,50 @@ def test_reschedule_logs_removed_jobs(tmp_path, caplog) -> None:
         date=date(2025, 1, 1),
         madhab="shafi",
         city="colombo",
-        times={"fajr": "05:00"},
+        times={"dhuhr": "12:00"},
     )
 
     with caplog.at_level("INFO"):
         job_scheduler.schedule_day(plan)
 
     assert "Removing job event_fajr_20250101" in caplog.text
+    assert paused_scheduler.get_job("event_other_20250102") is not None
+
+
+def test_reschedule_replaces_planned_jobs_without_removing(
+    paused_scheduler: BackgroundScheduler, caplog
+) -> None:
+    job_scheduler = JobScheduler(
+        scheduler=paused_scheduler,
+        handler=lambda *_: None,
+        now_provider=FixedNow(datetime(2025, 1, 1, 4, 0)).now,
+    )
+    plan = _plan_for(date(2025, 1, 1), {"fajr": "05:00"})
+    job_scheduler.schedule_day(plan)
+
+    with caplog.at_level("INFO"):
+        job_scheduler.schedule_day(_plan_for(date(2025, 1, 1), {"fajr": "05:10"}))
+
+    assert "Removing job" not in caplog.text
+    job = paused_scheduler.get_job("event_fajr_20250101")
+    assert job.next_run_time.replace(tzinfo=None) == datetime(2025, 1, 1, 5, 10)
+
 
 def _plan_for(day: date, times: dict[str, str]) -> DayPlan:
-    return DayPlan(date=day, madhab="shafi", city="colombo", times=times)
+    return _cached_plan(day, tuple(sorted(times.items())))
+
+
+@lru_cache(maxsize=None)
+def _cached_plan(day: date, time_items: tuple[tuple[str, str], ...]) -> DayPlan:
+    # Plans are never mutated by the scheduler, so identical ones can be shared.
+    return DayPlan(date=day, madhab="shafi", city="colombo", times=dict(time_items))
 
 
-def test_schedule_day_only_future_jobs() -> None:
+def test_schedule_day_only_future_jobs(paused_scheduler: BackgroundScheduler) -> None:
     today = date(2025, 1, 1)
     now = datetime(2025, 1, 1, 10, 0)
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
-
     job_scheduler = JobScheduler(
-        scheduler=scheduler,
+        scheduler=paused_scheduler,
         now_provider=FixedNow(now).now,
         handler=lambda *_: None,
     )
@@ -69,19 +93,30 @@ def test_schedule_day_only_future_jobs() -> None:
     plan = _plan_for(today, {"fajr": "05:00", "dhuhr": "12:00"})
     job_scheduler.schedule_day(plan)
 
-    jobs = scheduler.get_jobs()
+    jobs = paused_scheduler.get_jobs()
     assert len(jobs) == 1
     assert jobs[0].id.endswith("20250101")
 
 
-def test_schedule_day_adds_quran_jobs() -> None:
+@pytest.mark.parametrize("value", [" 5: 07", "05-07", "05:07:00", "24:00"])
+def test_schedule_day_rejects_malformed_times(
+    paused_scheduler: BackgroundScheduler, value: str
+) -> None:
+    job_scheduler = JobScheduler(
+        scheduler=paused_scheduler,
+        now_provider=FixedNow(datetime(2025, 1, 1, 4, 0)).now,
+        handler=lambda *_: None,
+    )
+
+    with pytest.raises(ValueError):
+        job_scheduler.schedule_day(_plan_for(date(2025, 1, 1), {"fajr": value}))
+
+
+def test_schedule_day_adds_quran_jobs(paused_scheduler: BackgroundScheduler) -> None:
     today = date(2025, 1, 1)
     now = datetime(2025, 1, 1, 6, 0)
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
-
     job_scheduler = JobScheduler(
-        scheduler=scheduler,
+        scheduler=paused_scheduler,
         now_provider=FixedNow(now).now,
         handler=lambda *_: None,
     )
@@ -90,19 +125,16 @@ def test_schedule_day_adds_quran_jobs() -> None:
     quran_schedule = ["06:30", "18:15"]
     job_scheduler.schedule_day(plan, quran_times=quran_schedule)
 
-    ids = sorted(job.id for job in scheduler.get_jobs())
+    ids = sorted(job.id for job in paused_scheduler.get_jobs())
     assert "quran_20250101_0630" in ids
     assert "quran_20250101_1815" in ids
 
 
-def test_reschedule_does_not_duplicate_jobs() -> None:
+def test_reschedule_does_not_duplicate_jobs(paused_scheduler: BackgroundScheduler) -> None:
     today = date(2025, 1, 1)
     now = datetime(2025, 1, 1, 10, 0)
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
-
     job_scheduler = JobScheduler(
-        scheduler=scheduler,
+        scheduler=paused_scheduler,
         now_provider=FixedNow(now).now,
         handler=lambda *_: None,
     )
@@ -111,24 +143,77 @@ def test_reschedule_does_not_duplicate_jobs() -> None:
     job_scheduler.schedule_day(plan)
     job_scheduler.schedule_day(plan)
 
-    jobs = scheduler.get_jobs()
+    jobs = paused_scheduler.get_jobs()
     assert len(jobs) == 1
 
 
-def test_schedule_day_removes_old_jobs_for_date() -> None:
+def test_reschedule_keeps_unchanged_jobs(paused_scheduler: BackgroundScheduler, caplog) -> None:
+    job_scheduler = JobScheduler(
+        scheduler=paused_scheduler,
+        handler=lambda *_: None,
+        now_provider=FixedNow(datetime(2025, 1, 1, 4, 0)).now,
+    )
+    job_scheduler.schedule_day(_plan_for(date(2025, 1, 1), {"fajr": "05:00"}))
+    # A fresh, equal plan, as a daily refresh would fetch, not the cached instance.
+    refreshed = DayPlan(
+        date=date(2025, 1, 1), madhab="shafi", city="colombo", times={"fajr": "05:00"}
+    )
+
+    with caplog.at_level("INFO"):
+        job_scheduler.schedule_day(refreshed)
+
+    assert "Keeping event_fajr_20250101" in caplog.text
+    assert "Scheduled event_fajr_20250101" not in caplog.text
+
+
+def test_reschedule_readds_jobs_when_another_time_changes(
+    paused_scheduler: BackgroundScheduler, caplog
+) -> None:
+    job_scheduler = JobScheduler(
+        scheduler=paused_scheduler,
+        handler=lambda *_: None,
+        now_provider=FixedNow(datetime(2025, 1, 1, 4, 0)).now,
+    )
+    job_scheduler.schedule_day(_plan_for(date(2025, 1, 1), {"fajr": "05:00", "dhuhr": "12:00"}))
+    # Jobs carry the whole plan, so a change elsewhere in it refreshes them all.
+    changed = DayPlan(
+        date=date(2025, 1, 1),
+        madhab="shafi",
+        city="colombo",
+        times={"fajr": "05:00", "dhuhr": "12:05"},
+    )
+
+    with caplog.at_level("INFO"):
+        job_scheduler.schedule_day(changed)
+
+    assert "Keeping event_fajr_20250101" not in caplog.text
+    assert "Scheduled event_fajr_20250101" in caplog.text
+    job = paused_scheduler.get_job("event_fajr_20250101")
+    assert job.args[0] is changed
+
+
+def test_refresh_job_tolerates_late_wakeups(paused_scheduler: BackgroundScheduler) -> None:
+    job_scheduler = JobScheduler(scheduler=paused_scheduler, handler=lambda *_: None)
+
+    job_scheduler.schedule_refresh_job()
+
+    job = paused_scheduler.get_job("refresh_daily")
+    assert job.misfire_grace_time == 3600
+    assert job.coalesce is True
+    assert job.max_instances == 1
+
+
+def test_schedule_day_removes_old_jobs_for_date(paused_scheduler: BackgroundScheduler) -> None:
     today = date(2025, 1, 1)
     now = datetime(2025, 1, 1, 6, 0)
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
-
     job_scheduler = JobScheduler(
-        scheduler=scheduler,
+        scheduler=paused_scheduler,
         now_provider=FixedNow(now).now,
         handler=lambda *_: None,
     )
 
-    stale_id = f"event_maghrib_{today.strftime('%Y%m%d')}"
-    scheduler.add_job(
+    stale_id = f"event_maghrib_{date_suffix(today)}"
+    paused_scheduler.add_job(
         lambda: None,
         trigger="date",
         id=stale_id,
@@ -139,6 +224,6 @@ def test_schedule_day_removes_old_jobs_for_date() -> None:
     plan = _plan_for(today, {"fajr": "05:00", "dhuhr": "12:00"})
     job_scheduler.schedule_day(plan)
 
-    jobs = scheduler.get_jobs()
+    jobs = paused_scheduler.get_jobs()
     assert len(jobs) == 1
     assert jobs[0].id.endswith("20250101")
@@ -18,10 +18,7 @@ class FixedNow:
 
 
 @pytest.mark.smoke
-def test_scheduler_creates_jobs_for_day_plan() -> None:
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
-
+def test_scheduler_creates_jobs_for_day_plan(paused_scheduler: BackgroundScheduler) -> None:
     plan = DayPlan(
         date=date(2025, 1, 1),
         madhab="shafi",
@@ -30,7 +27,7 @@ def test_scheduler_creates_jobs_for_day_plan() -> None:
     )
 
     job_scheduler = JobScheduler(
-        scheduler=scheduler,
+        scheduler=paused_scheduler,
         handler=lambda *_: None,
         now_provider=FixedNow(datetime(2025, 1, 1, 4, 0)).now,
     )
@@ -38,4 +35,4 @@ def test_scheduler_creates_jobs_for_day_plan() -> None:
     job_scheduler.schedule_day(plan)
 
     # Smoke check: two future jobs should be scheduled.
-    assert len(scheduler.get_jobs()) == 2
+    assert len(paused_scheduler.get_jobs()) == 2
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import date, datetime, timedelta
 
 import pytest
+from apscheduler.job import Job
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from prayerhub.test_scheduler import TestScheduleService
@@ -16,57 +17,57 @@ class FixedNow:
         return self._now
 
 
-def test_schedule_at_time_uses_today_or_tomorrow() -> None:
-    now = datetime(2025, 1, 1, 10, 0)
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
+# Fixed instants shared by every test instead of being rebuilt per assertion.
+_NOW = datetime(2025, 1, 1, 10, 0)
+_TODAY_1015 = datetime(2025, 1, 1, 10, 15)
+_TODAY_1100 = datetime(2025, 1, 1, 11, 0)
+_TOMORROW_0900 = datetime(2025, 1, 2, 9, 0)
 
+
+def _naive_run_time(job: Job) -> datetime:
+    # The scheduler localizes run times; the service works in naive wall-clock time.
+    return job.next_run_time.replace(tzinfo=None)
+
+
+def test_schedule_at_time_uses_today_or_tomorrow(paused_scheduler: BackgroundScheduler) -> None:
     service = TestScheduleService(
-        scheduler=scheduler,
-        now_provider=FixedNow(now).now,
+        scheduler=paused_scheduler,
+        now_provider=FixedNow(_NOW).now,
         handler=lambda: None,
         max_pending_tests=5,
         max_minutes_ahead=1440,
     )
 
     job_id = service.schedule_test_at_time("11:00")
-    job = scheduler.get_job(job_id)
+    job = paused_scheduler.get_job(job_id)
     assert job is not None
-    assert job.next_run_time.replace(tzinfo=None) == datetime(2025, 1, 1, 11, 0)
+    assert _naive_run_time(job) == _TODAY_1100
 
     job_id = service.schedule_test_at_time("09:00")
-    job = scheduler.get_job(job_id)
+    job = paused_scheduler.get_job(job_id)
     assert job is not None
-    assert job.next_run_time.replace(tzinfo=None) == datetime(2025, 1, 2, 9, 0)
-
+    assert _naive_run_time(job) == _TOMORROW_0900
 
-def test_schedule_in_minutes_creates_future_job() -> None:
-    now = datetime(2025, 1, 1, 10, 0)
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
 
+def test_schedule_in_minutes_creates_future_job(paused_scheduler: BackgroundScheduler) -> None:
     service = TestScheduleService(
-        scheduler=scheduler,
-        now_provider=FixedNow(now).now,
+        scheduler=paused_scheduler,
+        now_provider=FixedNow(_NOW).now,
         handler=lambda: None,
         max_pending_tests=5,
         max_minutes_ahead=1440,
     )
 
     job_id = service.schedule_test_in_minutes(15)
-    job = scheduler.get_job(job_id)
+    job = paused_scheduler.get_job(job_id)
     assert job is not None
-    assert job.next_run_time.replace(tzinfo=None) == datetime(2025, 1, 1, 10, 15)
+    assert _naive_run_time(job) == _TODAY_1015
 
 
-def test_schedule_rejects_past_or_too_far() -> None:
-    now = datetime(2025, 1, 1, 10, 0)
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
-
+def test_schedule_rejects_past_or_too_far(paused_scheduler: BackgroundScheduler) -> None:
     service = TestScheduleService(
-        scheduler=scheduler,
-        now_provider=FixedNow(now).now,
+        scheduler=paused_scheduler,
+        now_provider=FixedNow(_NOW).now,
         handler=lambda: None,
         max_pending_tests=5,
         max_minutes_ahead=60,
@@ -79,14 +80,10 @@ def test_schedule_rejects_past_or_too_far() -> None:
         service.schedule_test_in_minutes(61)
 
 
-def test_cancel_removes_job() -> None:
-    now = datetime(2025, 1, 1, 10, 0)
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
-
+def test_cancel_removes_job(paused_scheduler: BackgroundScheduler) -> None:
     service = TestScheduleService(
-        scheduler=scheduler,
-        now_provider=FixedNow(now).now,
+        scheduler=paused_scheduler,
+        now_provider=FixedNow(_NOW).now,
         handler=lambda: None,
         max_pending_tests=5,
         max_minutes_ahead=1440,
@@ -94,17 +91,13 @@ def test_cancel_removes_job() -> None:
 
     job_id = service.schedule_test_in_minutes(10)
     assert service.cancel_test_job(job_id) is True
-    assert scheduler.get_job(job_id) is None
-
+    assert paused_scheduler.get_job(job_id) is None
 
-def test_max_pending_tests_enforced() -> None:
-    now = datetime(2025, 1, 1, 10, 0)
-    scheduler = BackgroundScheduler()
-    scheduler.start(paused=True)
 
+def test_max_pending_tests_enforced(paused_scheduler: BackgroundScheduler) -> None:
     service = TestScheduleService(
-        scheduler=scheduler,
-        now_provider=FixedNow(now).now,
+        scheduler=paused_scheduler,
+        now_provider=FixedNow(_NOW).now,
         handler=lambda: None,
         max_pending_tests=1,
         max_minutes_ahead=1440,